@@ -1,19 +1,29 @@
+from functools import lru_cache
+import os
+
 from binance.client import Client
 from dotenv import load_dotenv
-import os
+import pandas as pd
+
+
+@lru_cache(maxsize=1)
+def _get_client() -> Client:
+    load_dotenv("config/.env")
+    api_key = os.getenv("BINANCE_API_KEY")
+    api_secret = os.getenv("BINANCE_API_SECRET")
+    return Client(api_key, api_secret, testnet=True)
+
 
-load_dotenv("config/.env")
+def main():
+    account = _get_client().get_account()
 
-api_key = os.getenv("BINANCE_API_KEY")
-api_secret = os.getenv("BINANCE_API_SECRET")
+    balances = pd.DataFrame(account["balances"], columns=["asset", "free", "locked"])
+    balances[["free", "locked"]] = balances[["free", "locked"]].apply(pd.to_numeric)
+    non_zero = balances[(balances["free"] > 0) | (balances["locked"] > 0)]
 
-client = Client(api_key, api_secret, testnet=True)
+    print("=== BALANCES ===")
+    print(non_zero.to_string(index=False))
 
-account = client.get_account()
 
-print("=== BALANCES ===")
-for bal in account["balances"]:
-    free = float(bal["free"])
-    locked = float(bal["locked"])
-    if free > 0 or locked > 0:
-        print(f"{bal['asset']}: free={bal['free']} locked={bal['locked']}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
 import os
 import sys
-from datetime import datetime
 
 import pandas as pd
 import streamlit as st
@@ -11,40 +10,78 @@ PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
+from src.live_stats import compute_live_stats
+from src.trade_log import load_trades_incremental
 from src.wallet import get_equity_snapshot  # you already have this
 
 LOGS_DIR = os.path.join(PROJECT_ROOT, "logs")
 TRADES_CSV_PATH = os.path.join(LOGS_DIR, "live_trades.csv")
 
+# Most recent trades shown in the history table
+TRADE_HISTORY_ROWS = 200
+
+# Trade log column -> how the history table labels and formats it (in order)
+TRADE_HISTORY_COLUMNS = {
+    "time": st.column_config.DatetimeColumn("Time", format="DD MMM YYYY . HH:mm [UTC]"),
+    "symbol": st.column_config.TextColumn("Symbol"),
+    "side": st.column_config.TextColumn("Side"),
+    "size": st.column_config.NumberColumn("Size"),
+    "entry_price": st.column_config.NumberColumn("Entry Price"),
+    "exit_price": st.column_config.NumberColumn("Exit Price"),
+    "return_pct": st.column_config.NumberColumn("Return (%)", format="%.2f%%"),
+    "exit_reason": st.column_config.TextColumn("Exit Reason"),
+}
+
 # -------------------------------------------------------------------
 # HELPER FUNCTIONS
 # -------------------------------------------------------------------
-def format_trade_time(ts: str) -> str:
+# Internal exit reasons -> human-friendly labels (others are title-cased)
+EXIT_REASON_LABELS = {
+    "take_profit": "Take Profit",
+    "signal": "RSI Exit",
+    "stop_loss": "Stop Loss",
+    "manual": "Manual Exit",
+}
+
+def format_exit_reasons(reasons: pd.Series) -> pd.Series:
     """
-    Convert ISO timestamp to redable UTC time.
+    Map internal exit reasons to human-friendly labels, vectorized.
     """
-    try:
-        dt = datetime.fromisoformat(ts.replace("Z", ""))
-        return dt.strftime("%d %b %Y . %H:%M UTC")
-    except Exception:
-        return ts
+    reasons = reasons.fillna("").astype(str)
+    return reasons.map(EXIT_REASON_LABELS).fillna(reasons.str.replace("_", " ").str.title())
 
-def format_exit_reason(reason: str) -> str:
+@st.cache_data(ttl=15, show_spinner=False)
+def _equity_snapshot(symbols: tuple[str, ...]) -> dict:
     """
-    Map internal exit reasons to human-friendly labels.
+    Wallet equity snapshot, reused for a few seconds so reruns don't each
+    hit the Binance account + price endpoints.
     """
-    mapping = {
-        "take_profit": "Take Profit",
-        "signal": "RSI Exit",
-        "stop_loss": "Stop Loss",
-        "manual": "Manual Exit",
-    }
-    return mapping.get(reason, reason.replace("_", " ").title())
+    return get_equity_snapshot(symbols=symbols)
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _live_stats(
+    path: str,
+    num_rows: int,
+    file_version: tuple[int, int],
+    initial_equity: float,
+    _trades_df: pd.DataFrame,
+) -> dict:
+    """
+    Stats for the trade log, recomputed only when the log changes and
+    returned without a copy. Keyed on the row count plus the log's
+    (size, mtime_ns), so a rotated or rewritten log of the same length
+    isn't served from the old stats.
+    """
+    return compute_live_stats(_trades_df, initial_equity=initial_equity)
 
 # -------------------------------------------------------------------
 # STYLING
 # -------------------------------------------------------------------
-def inject_global_css():
+@st.cache_resource(show_spinner=False)
+def _global_css() -> str:
+    """
+    The <style> block, built once per process and returned as-is on reruns.
+    """
     css = """
     /* Global background */
     .stApp {
@@ -164,72 +201,28 @@ def inject_global_css():
         box-shadow: 0 0 10px rgba(248, 113, 113, 0.9);
     }
     """
-    st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+    return f"<style>{css}</style>"
 
 
-# -------------------------------------------------------------------
-# STATS
-# -------------------------------------------------------------------
-def compute_live_stats(trades_df: pd.DataFrame, initial_equity: float):
+def inject_global_css():
+    # Streamlit rebuilds the page on every rerun, so the markdown call itself
+    # has to stay; only the string is cached
+    st.markdown(_global_css(), unsafe_allow_html=True)
+
+
+def render_kpi_row(cards: list[tuple[str, str, str, str]]):
     """
-    Compute equity, pnl, winrate, max drawdown, using return_pct / pnl_pct / pnl_usdt.
+    Render (label, value, meta, color) cards as one flex .kpi-row, in a
+    single st.markdown call instead of one column + element per card.
     """
-    if trades_df.empty:
-        return {
-            "final_equity": initial_equity,
-            "total_pnl_usdt": 0.0,
-            "total_pnl_pct": 0.0,
-            "num_trades": 0,
-            "win_rate_pct": 0.0,
-            "max_drawdown_pct": 0.0,
-        }
-
-    # Determine per-trade PnL in USDT
-    if "pnl_usdt" in trades_df.columns:
-        pnl_usdt = trades_df["pnl_usdt"].astype(float)
-
-    elif "pnl_pct" in trades_df.columns:
-        pnl_usdt = initial_equity * trades_df["pnl_pct"].astype(float) / 100.0
-
-    elif "return_pct" in trades_df.columns:
-        pnl_usdt = initial_equity * trades_df["return_pct"].astype(float) / 100.0
-
-    else:
-        pnl_usdt = pd.Series([0.0] * len(trades_df))
-
-    # Equity curve
-    equity_curve = initial_equity + pnl_usdt.cumsum()
-
-    # Win rate
-    if "pnl_usdt" in trades_df.columns:
-        wins = (trades_df["pnl_usdt"].astype(float) > 0).sum()
-    elif "pnl_pct" in trades_df.columns:
-        wins = (trades_df["pnl_pct"].astype(float) > 0).sum()
-    elif "return_pct" in trades_df.columns:
-        wins = (trades_df["return_pct"].astype(float) > 0).sum()
-    else:
-        wins = 0
-
-    num_trades = len(trades_df)
-    win_rate_pct = (wins / num_trades) * 100 if num_trades > 0 else 0.0
-
-    total_pnl_usdt = float(pnl_usdt.sum())
-    final_equity = float(equity_curve.iloc[-1])
-    total_pnl_pct = (final_equity / initial_equity - 1.0) * 100 if initial_equity > 0 else 0.0
-
-    # Max drawdown
-    roll_max = equity_curve.cummax()
-    drawdown = (equity_curve - roll_max) / roll_max
-    max_drawdown_pct = float(drawdown.min() * 100.0)
-
-    return {
-        "final_equity": final_equity,
-        "total_pnl_usdt": total_pnl_usdt,
-        "total_pnl_pct": total_pnl_pct,
-        "num_trades": num_trades,
-        "win_rate_pct": win_rate_pct,
-        "max_drawdown_pct": max_drawdown_pct,
-    }
+    html = []
+    for label, value, meta, color in cards:
+        meta_html = f'<div class="kpi-meta">{meta}</div>' if meta else ""
+        html.append(
+            f'<div class="kpi-card"><div class="kpi-label">{label}</div>'
+            f'<div class="kpi-value {color}">{value}</div>{meta_html}</div>'
+        )
+    st.markdown(f'<div class="kpi-row">{"".join(html)}</div>', unsafe_allow_html=True)
 
 
 # -------------------------------------------------------------------
@@ -253,88 +246,35 @@ def main():
     # Load live trade log
     initial_equity = 10_000.0  # adjust if your bot started with a different testnet size
     if os.path.exists(TRADES_CSV_PATH):
-        trades_df = pd.read_csv(TRADES_CSV_PATH)
+        # only rows appended since the last rerun are parsed
+        trades_df = load_trades_incremental(TRADES_CSV_PATH)
+        stat = os.stat(TRADES_CSV_PATH)
+        stats = _live_stats(
+            TRADES_CSV_PATH, len(trades_df), (stat.st_size, stat.st_mtime_ns), initial_equity, trades_df
+        )
     else:
         trades_df = pd.DataFrame()
-
-    # Compute stats
-    stats = compute_live_stats(trades_df, initial_equity=initial_equity)
+        stats = compute_live_stats(trades_df, initial_equity=initial_equity)
 
     # Get equity snapshot from wallet (USDT + BTC/ETH holdings)
-    snapshot = get_equity_snapshot(symbols=("BTCUSDT", "ETHUSDT"))
+    if st.button("Refresh equity", key="refresh_equity"):
+        _equity_snapshot.clear()
+    snapshot = _equity_snapshot(("BTCUSDT", "ETHUSDT"))
     live_equity = snapshot["equity_usdt"]
     pnl_vs_start = snapshot["pnl_pct"]
 
     # TOP KPI ROW
-    kpi_cols = st.columns(5)
-    with kpi_cols[0]:
-        st.markdown(
-            f"""
-            <div class="kpi-card">
-                <div class="kpi-label">Initial Equity</div>
-                <div class="kpi-value">${initial_equity:,.2f}</div>
-                <div class="kpi-meta">Baseline (Day 0)</div>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-    with kpi_cols[1]:
-        st.markdown(
-            f"""
-            <div class="kpi-card">
-                <div class="kpi-label">Current Equity (Wallet)</div>
-                <div class="kpi-value">{live_equity:,.2f} USDT</div>
-                <div class="kpi-meta">Includes coins + USDT</div>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-    with kpi_cols[2]:
-        pnl_color = "green" if stats["total_pnl_usdt"] >= 0 else "red"
-        st.markdown(
-            f"""
-            <div class="kpi-card">
-                <div class="kpi-label">Total PnL (from trade log)</div>
-                <div class="kpi-value {pnl_color}">
-                    {stats["total_pnl_usdt"]:,.2f} USDT
-                </div>
-                <div class="kpi-meta">{stats["total_pnl_pct"]:,.2f}% vs initial</div>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-    with kpi_cols[3]:
-        win_color = "green" if stats["win_rate_pct"] >= 50 else "red"
-        st.markdown(
-            f"""
-            <div class="kpi-card">
-                <div class="kpi-label">Win Rate</div>
-                <div class="kpi-value {win_color}">
-                    {stats["win_rate_pct"]:,.2f}%
-                </div>
-                <div class="kpi-meta">{stats["num_trades"]} closed trades</div>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-    with kpi_cols[4]:
-        dd_color = "green" if stats["max_drawdown_pct"] > -5 else "red"
-        st.markdown(
-            f"""
-            <div class="kpi-card">
-                <div class="kpi-label">Max Drawdown</div>
-                <div class="kpi-value {dd_color}">
-                    {stats["max_drawdown_pct"]:,.2f}%
-                </div>
-                <div class="kpi-meta">From equity peaks</div>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+    pnl_color = "green" if stats["total_pnl_usdt"] >= 0 else "red"
+    win_color = "green" if stats["win_rate_pct"] >= 50 else "red"
+    dd_color = "green" if stats["max_drawdown_pct"] > -5 else "red"
+    render_kpi_row([
+        ("Initial Equity", f"${initial_equity:,.2f}", "Baseline (Day 0)", ""),
+        ("Current Equity (Wallet)", f"{live_equity:,.2f} USDT", "Includes coins + USDT", ""),
+        ("Total PnL (from trade log)", f"{stats['total_pnl_usdt']:,.2f} USDT",
+         f"{stats['total_pnl_pct']:,.2f}% vs initial", pnl_color),
+        ("Win Rate", f"{stats['win_rate_pct']:,.2f}%", f"{stats['num_trades']} closed trades", win_color),
+        ("Max Drawdown", f"{stats['max_drawdown_pct']:,.2f}%", "From equity peaks", dd_color),
+    ])
 
     # BOT STATUS PILL
     col_status, col_spacer = st.columns([1, 3])
@@ -360,26 +300,14 @@ def main():
     st.markdown('<div class="section-title">Live Performance</div>', unsafe_allow_html=True)
     st.markdown('<div class="section-subtitle">Based on closed trades only.</div>',unsafe_allow_html=True)
 
-    p1, p2, p3, p4, p5, p6 = st.columns(6)
-    cards = [
-        ("Final Equity", f"{stats['final_equity']:,.2f}"),
-        ("Total PnL", f"{stats['total_pnl_usdt']:,.2f} USDT"),
-        ("PnL %", f"{stats['total_pnl_pct']:.2f}%"),
-        ("Win Rate", f"{stats['win_rate_pct']:.2f}%"),
-        ("Trades", str(stats["num_trades"])),
-        ("Max Drawdown", f"{stats['max_drawdown_pct']:.2f}%"),
-    ]
-
-    for col, (label, value) in zip([p1, p2, p3, p4, p5, p6], cards):
-        col.markdown(
-            f"""
-            <div class="kpi-card">
-                <div class="kpi-label">{label}</div>
-                <div class="kpi-value">{value}</div>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+    render_kpi_row([
+        ("Final Equity", f"{stats['final_equity']:,.2f}", "", ""),
+        ("Total PnL", f"{stats['total_pnl_usdt']:,.2f} USDT", "", ""),
+        ("PnL %", f"{stats['total_pnl_pct']:.2f}%", "", ""),
+        ("Win Rate", f"{stats['win_rate_pct']:.2f}%", "", ""),
+        ("Trades", str(stats["num_trades"]), "", ""),
+        ("Max Drawdown", f"{stats['max_drawdown_pct']:.2f}%", "", ""),
+    ])
 
 # -------------------------------------------------------------------
 # EQUITY CURVE
@@ -390,10 +318,9 @@ def main():
         unsafe_allow_html=True,
     )
 
-    if not trades_df.empty:
-        pnl_pct = trades_df["return_pct"].astype(float)
-        equity = initial_equity + (initial_equity * pnl_pct / 100).cumsum()
-        st.line_chart(equity)
+    if stats["equity_curve"] is not None:
+        # same curve compute_live_stats already built for the drawdown
+        st.line_chart(stats["equity_curve"])
     else:
         st.info("No closed trades yet.")
 
@@ -402,58 +329,33 @@ def main():
 # -------------------------------------------------------------------
     st.markdown('<div class="section-title">Live Trade History</div>', unsafe_allow_html=True)
     st.markdown(
-        '<div class="section-subtitle">Most recent trades first. Pulled from logs/live_trades.csv.</div>',
+        f'<div class="section-subtitle">Latest {TRADE_HISTORY_ROWS} trades, most recent first. Pulled from logs/live_trades.csv.</div>',
         unsafe_allow_html=True,
     )
 
     if not trades_df.empty:
-        df = trades_df.copy()
-
-        # ---- format time + exit_reason BEFORE renaming ----
-        if "time" in df.columns:
-            df["Time"] = df["time"].apply(format_trade_time)
-            df["time_parsed"] = pd.to_datetime(df["time"], errors="coerce")
-        else:
-            df["Time"] = ""
-
+        # ---- newest first: the log is append-only, so rows are already in
+        # time order and only the tail is sent to the table ----
+        df = trades_df.iloc[::-1].head(TRADE_HISTORY_ROWS)
+
+        # Times and numbers are formatted client-side via column_config; only
+        # exit reasons need a (vectorized) relabel, which needs a copy
+        updates = {}
+        if "time" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["time"]):
+            updates["time"] = pd.to_datetime(df["time"], errors="coerce", format="ISO8601")
         if "exit_reason" in df.columns:
-            df["Exit Reason"] = df["exit_reason"].apply(format_exit_reason)
-        else:
-            df["Exit Reason"] = ""
-
-        # ---- rename the rest nicely ----
-        df = df.rename(
-            columns={
-                "symbol": "Symbol",
-                "side": "Side",
-                "size": "Size",
-                "entry_price": "Entry Price",
-                "exit_price": "Exit Price",
-                "return_pct": "Return (%)",
-            }
+            updates["exit_reason"] = format_exit_reasons(df["exit_reason"])
+        if updates:
+            df = df.assign(**updates)
+
+        st.dataframe(
+            df,
+            column_order=[c for c in TRADE_HISTORY_COLUMNS if c in df.columns],
+            column_config=TRADE_HISTORY_COLUMNS,
+            width="stretch",
+            hide_index=True,
         )
 
-        # ---- sort newest first ----
-        if "time_parsed" in df.columns:
-            df = df.sort_values("time_parsed", ascending=False).drop(columns=["time_parsed"])
-        else:
-            df = df.iloc[::-1]
-
-        # ---- show only clean columns (no raw snake_case) ----
-        wanted_cols = [
-            "Time",
-            "Symbol",
-            "Side",
-            "Size",
-            "Entry Price",
-            "Exit Price",
-            "Return (%)",
-            "Exit Reason",
-        ]
-        wanted_cols = [c for c in wanted_cols if c in df.columns]
-
-        st.dataframe(df[wanted_cols], use_container_width=True, hide_index=True)
-
     else:
         st.info("No live trades logged yet.")
 
@@ -1,7 +1,6 @@
 # main_backtest.py
-from src.data import get_historical_klines
-from src.indicators import add_indicators
-from src.strategy import generate_signals
+from src.data import get_historical_klines_cached
+from src.strategy import compute_signals
 from src.backtester import run_backtest
 
 def main():
@@ -9,9 +8,8 @@ def main():
     interval = "1m"
     limit = 500
 
-    df = get_historical_klines(symbol=symbol, interval=interval, limit=limit)
-    df = add_indicators(df)
-    df = generate_signals(df)
+    df = get_historical_klines_cached(symbol=symbol, interval=interval, limit=limit)
+    df = compute_signals(df)
 
 
     result = run_backtest(df)
@@ -1,21 +1,62 @@
 # main_live.py
+import argparse
 import time
 
 from src.config import TRADING_ENV
-from src.live_trader import live_step_rsi_v1
+from src.live_trader import live_step_rsi_v1, live_stream_rsi_v1
 from src.runtime_state import load_state
 
 POLL_SECONDS = 60  # how often to trade/check
 
 
+def run_stream():
+    """
+    Opt-in (--stream): trade on the kline websocket instead of polling.
+    The config is read once at start, so dashboard changes (including
+    disabling the bot) take effect on restart.
+    """
+    rs = load_state()
+    if not rs["bot_enabled"]:
+        print("[INFO] Bot is currently DISABLED (set via dashboard). Not starting the stream.")
+        return
+
+    print(f"[INFO] Bot ENABLED for {rs['symbol']} ({rs['interval']}), streaming klines")
+    live_stream_rsi_v1(
+        symbol=rs["symbol"],
+        interval=rs["interval"],
+        history_candles=rs["history_candles"],
+        position_size_usdt=rs["position_size_usdt"],
+        entry_rsi=rs["entry_rsi"],
+        exit_rsi=rs["exit_rsi"],
+        take_profit_pct=rs["take_profit_pct"],
+    )
+
+
 def main():
+    parser = argparse.ArgumentParser(description="RSI Strategy V1 live daemon (testnet).")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="act on closed klines from the websocket instead of polling every POLL_SECONDS",
+    )
+    args = parser.parse_args()
+
     print("=== Smart Trading Bot — Live Daemon (DEMO / TESTNET) ===")
     print(f"TRADING_ENV: {TRADING_ENV}")
     if TRADING_ENV != "testnet":
         raise RuntimeError("For demo running, TRADING_ENV must be 'testnet' in config/.env")
 
+    if args.stream:
+        run_stream()
+        return
+
     state = None  # internal bot position state
 
+    # Steps run on a fixed POLL_SECONDS grid from start-up, so the time a
+    # step takes doesn't push every later poll back (drift-corrected sleep)
+    start = time.monotonic()
+    tick = 0
+
     while True:
         try:
             rs = load_state()
@@ -44,7 +85,10 @@ def main():
         except Exception as e:
             print("[ERROR] Exception in main loop:", e)
 
-        time.sleep(POLL_SECONDS)
+        # Next grid slot; if the step overran one or more slots, skip them
+        # rather than firing back-to-back catch-up steps
+        tick = max(tick + 1, int((time.monotonic() - start) // POLL_SECONDS) + 1)
+        time.sleep(max(0.0, start + tick * POLL_SECONDS - time.monotonic()))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,19 @@
+# src/_njit.py
+"""
+Optional Numba support.
+
+numba is not a hard dependency: without it `njit` becomes a no-op decorator
+and callers can check NUMBA_AVAILABLE to pick a vectorized NumPy path instead.
+"""
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        # Support both @njit and @njit(cache=True, ...)
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
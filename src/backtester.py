@@ -1,135 +1,248 @@
 # src/backtester.py
+import numpy as np
 import pandas as pd
 
+from ._njit import NUMBA_AVAILABLE, njit
 
-def run_backtest(
-    df: pd.DataFrame,
-    initial_balance: float = 10_000.0,
-    fee_rate: float = 0.0004,            # 0.04% per trade
-    stop_loss_pct: float | None = None,  # e.g. 0.02 for 2%
-    take_profit_pct: float | None = None # e.g. 0.04 for 4%
-) -> dict:
+# Exit reason codes used by the kernel -> labels in the trades DataFrame
+_EXIT_REASONS = ("signal", "take_profit", "stop_loss")
+_EXIT_SIGNAL, _EXIT_TAKE_PROFIT, _EXIT_STOP_LOSS = 0, 1, 2
+
+
+@njit(cache=True)
+def _backtest_kernel(close, high, low, signal, initial_balance, fee_rate, stop_loss_pct, take_profit_pct):
     """
-    Backtester based on 'signal' column.
-    Assumes:
-      - signal 1 => go long
-      - signal -1 => exit to cash
-      - no shorting
+    Long/flat state machine over raw arrays (see run_backtest for the rules).
+    stop_loss_pct / take_profit_pct are NaN when disabled.
 
-    If stop_loss_pct / take_profit_pct are provided, exits can happen earlier,
-    based on intrabar high/low (conservative assumption when both hit).
+    Returns the per-bar equity and, for the first `num_trades` slots, each
+    trade's entry/exit bar index, entry/exit price and exit reason code.
     """
-    df = df.copy()
-    if "signal" not in df:
-        raise ValueError("DataFrame must have 'signal' column from strategy.generate_signals")
+    n = close.shape[0]
+    equity = np.empty(n)
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    entry_px = np.empty(n)
+    exit_px = np.empty(n)
+    reasons = np.empty(n, dtype=np.int8)
+    num_trades = 0
 
     balance_usdt = initial_balance
-    position_size = 0.0           # amount of coin
-    position_state = "CASH"
+    position_size = 0.0
+    in_position = False
+    entry_price = 0.0
+    entry_i = 0
 
-    equity_curve = []
-    trades = []
+    # SL/TP are fixed for the run and their levels for the whole trade, so
+    # both are resolved once (per run / per entry) instead of on every bar
+    use_tp = not np.isnan(take_profit_pct)
+    use_sl = not np.isnan(stop_loss_pct)
+    tp_level = 0.0
+    sl_level = 0.0
 
-    entry_price = None
-    entry_time = None
-
-    for timestamp, row in df.iterrows():
-        price_close = row["close"]
-        price_high = row["high"]
-        price_low = row["low"]
-        sig = row["signal"]
+    for i in range(n):
+        sig = signal[i]
 
         # --- Manage open position first (SL/TP + signal exit) ---
-        if position_state == "LONG":
-            hit_tp = False
-            hit_sl = False
-            exit_reason = None
-            exit_price = None
+        if in_position:
+            exit_reason = -1
+            exit_price = 0.0
 
             # Take-profit condition
-            if take_profit_pct is not None and entry_price is not None:
-                tp_level = entry_price * (1 + take_profit_pct)
-                if price_high >= tp_level:
-                    hit_tp = True
-                    exit_reason = "take_profit"
-                    exit_price = tp_level
+            if use_tp and high[i] >= tp_level:
+                exit_reason = _EXIT_TAKE_PROFIT
+                exit_price = tp_level
 
-            # Stop-loss condition
-            if stop_loss_pct is not None and entry_price is not None:
-                sl_level = entry_price * (1 - stop_loss_pct)
-                if price_low <= sl_level:
-                    # If both SL and TP hit same bar, assume worst case (SL first)
-                    hit_sl = True
-                    exit_reason = "stop_loss"
-                    exit_price = sl_level
+            # Stop-loss condition; if both hit the same bar, assume worst case (SL first)
+            if use_sl and low[i] <= sl_level:
+                exit_reason = _EXIT_STOP_LOSS
+                exit_price = sl_level
 
-            # If SL/TP hit, exit immediately
-            if hit_tp or hit_sl:
-                exit_time = timestamp
+            # Otherwise check the strategy exit signal
+            if exit_reason == -1 and sig == -1:
+                exit_reason = _EXIT_SIGNAL
+                exit_price = close[i]
 
+            if exit_reason != -1:
                 balance_usdt = position_size * exit_price * (1 - fee_rate)
                 position_size = 0.0
-                position_state = "CASH"
-
-                trade_return_pct = (exit_price - entry_price) / entry_price * 100
-                trades.append({
-                    "entry_time": entry_time,
-                    "exit_time": exit_time,
-                    "entry_price": entry_price,
-                    "exit_price": exit_price,
-                    "return_pct": trade_return_pct,
-                    "exit_reason": exit_reason,
-                })
-
-                entry_price = None
-                entry_time = None
-
-            # If still long after SL/TP logic, check strategy exit signal
-            elif sig == -1:
-                exit_reason = "signal"
-                exit_price = price_close
-                exit_time = timestamp
+                in_position = False
 
-                balance_usdt = position_size * exit_price * (1 - fee_rate)
-                position_size = 0.0
-                position_state = "CASH"
-
-                trade_return_pct = (exit_price - entry_price) / entry_price * 100
-                trades.append({
-                    "entry_time": entry_time,
-                    "exit_time": exit_time,
-                    "entry_price": entry_price,
-                    "exit_price": exit_price,
-                    "return_pct": trade_return_pct,
-                    "exit_reason": exit_reason,
-                })
-
-                entry_price = None
-                entry_time = None
+                entry_idx[num_trades] = entry_i
+                exit_idx[num_trades] = i
+                entry_px[num_trades] = entry_price
+                exit_px[num_trades] = exit_price
+                reasons[num_trades] = exit_reason
+                num_trades += 1
 
         # --- Check for new entries (after exits) ---
-        if position_state == "CASH" and sig == 1:
+        if not in_position and sig == 1:
             # enter long using all balance
-            entry_price = price_close
-            entry_time = timestamp
-
+            entry_price = close[i]
+            entry_i = i
             position_size = (balance_usdt * (1 - fee_rate)) / entry_price
             balance_usdt = 0.0
-            position_state = "LONG"
+            in_position = True
+            if use_tp:
+                tp_level = entry_price * (1 + take_profit_pct)
+            if use_sl:
+                sl_level = entry_price * (1 - stop_loss_pct)
 
         # --- Compute equity at this bar ---
-        if position_state == "LONG":
-            equity = position_size * price_close
+        if in_position:
+            equity[i] = position_size * close[i]
         else:
-            equity = balance_usdt
+            equity[i] = balance_usdt
+
+    return equity, num_trades, entry_idx, exit_idx, entry_px, exit_px, reasons
+
+
+def _backtest_numpy(close, high, low, signal, initial_balance, fee_rate, stop_loss_pct, take_profit_pct):
+    """
+    Same contract and results as _backtest_kernel, used when numba isn't
+    installed. Python only loops once per trade: each trade's exit bar is
+    found with vectorized SL/TP/signal searches over the bars it can span
+    (up to the next exit signal), and equity is filled in slices.
+    """
+    n = close.shape[0]
+    equity = np.empty(n)
+    entries = np.flatnonzero(signal == 1)
+    exits = np.flatnonzero(signal == -1)
+    use_tp = not np.isnan(take_profit_pct)
+    use_sl = not np.isnan(stop_loss_pct)
+
+    m = entries.shape[0]
+    entry_idx = np.empty(m, dtype=np.int64)
+    exit_idx = np.empty(m, dtype=np.int64)
+    entry_px = np.empty(m)
+    exit_px = np.empty(m)
+    reasons = np.empty(m, dtype=np.int8)
+    num_trades = 0
+
+    balance_usdt = initial_balance
+    i = entries[0] if m else n
+    equity[:i] = balance_usdt
 
-        equity_curve.append({"time": timestamp, "equity": equity})
+    while i < n:
+        # enter long using all balance
+        entry_price = close[i]
+        position_size = (balance_usdt * (1 - fee_rate)) / entry_price
+        balance_usdt = 0.0
 
-    # Build equity curve df
-    eq_df = pd.DataFrame(equity_curve).set_index("time")
-    total_return = (eq_df["equity"].iloc[-1] / initial_balance) - 1
+        # The trade closes at the latest on the next exit signal
+        x = np.searchsorted(exits, i, side="right")
+        last = exits[x] if x < exits.shape[0] else n - 1
+        hit = np.zeros(last - i, dtype=np.bool_)
+        if use_tp:
+            tp_level = entry_price * (1 + take_profit_pct)
+            hit_tp = high[i + 1:last + 1] >= tp_level
+            hit |= hit_tp
+        if use_sl:
+            sl_level = entry_price * (1 - stop_loss_pct)
+            hit_sl = low[i + 1:last + 1] <= sl_level
+            hit |= hit_sl
+        if x < exits.shape[0]:
+            hit[-1] = True
 
-    trades_df = pd.DataFrame(trades)
+        if not hit.any():
+            # still open at the end of the data
+            equity[i:] = position_size * close[i:]
+            break
+
+        k = int(np.argmax(hit))
+        j = i + 1 + k
+        # If both SL and TP hit same bar, assume worst case (SL first)
+        if use_sl and hit_sl[k]:
+            exit_reason, exit_price = _EXIT_STOP_LOSS, sl_level
+        elif use_tp and hit_tp[k]:
+            exit_reason, exit_price = _EXIT_TAKE_PROFIT, tp_level
+        else:
+            exit_reason, exit_price = _EXIT_SIGNAL, close[j]
+
+        equity[i:j] = position_size * close[i:j]
+        balance_usdt = position_size * exit_price * (1 - fee_rate)
+
+        entry_idx[num_trades] = i
+        exit_idx[num_trades] = j
+        entry_px[num_trades] = entry_price
+        exit_px[num_trades] = exit_price
+        reasons[num_trades] = exit_reason
+        num_trades += 1
+
+        # A SL/TP exit on a buy-signal bar re-enters on that same bar
+        if exit_reason != _EXIT_SIGNAL and signal[j] == 1:
+            i = j
+            continue
+
+        y = np.searchsorted(entries, j, side="right")
+        nxt = entries[y] if y < m else n
+        equity[j:nxt] = balance_usdt
+        i = nxt
+
+    return equity, num_trades, entry_idx, exit_idx, entry_px, exit_px, reasons
+
+
+def run_backtest(
+    df: pd.DataFrame,
+    initial_balance: float = 10_000.0,
+    fee_rate: float = 0.0004,            # 0.04% per trade
+    stop_loss_pct: float | None = None,  # e.g. 0.02 for 2%
+    take_profit_pct: float | None = None # e.g. 0.04 for 4%
+) -> dict:
+    """
+    Backtester based on 'signal' column.
+    Assumes:
+      - signal 1 => go long
+      - signal -1 => exit to cash
+      - no shorting
+
+    If stop_loss_pct / take_profit_pct are provided, exits can happen earlier,
+    based on intrabar high/low (conservative assumption when both hit).
+    """
+    if "signal" not in df:
+        raise ValueError("DataFrame must have 'signal' column from strategy.generate_signals")
+
+    # df is only read, never copied; it just has to be in bar order
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+
+    # The strategies emit int8 signals, passed through as-is; anything else
+    # (e.g. a hand-built float column) goes in as float64
+    signal = df["signal"].to_numpy()
+    if signal.dtype != np.int8:
+        signal = signal.astype(np.float64)
+
+    # Unit-stride arrays (no-op for the usual column-per-block frames), so the
+    # kernel gets one contiguous specialization whatever the frame's layout
+    backtest = _backtest_kernel if NUMBA_AVAILABLE else _backtest_numpy
+    equity, num_trades, entry_idx, exit_idx, entry_px, exit_px, reasons = backtest(
+        np.ascontiguousarray(df["close"].to_numpy(np.float64)),
+        np.ascontiguousarray(df["high"].to_numpy(np.float64)),
+        np.ascontiguousarray(df["low"].to_numpy(np.float64)),
+        np.ascontiguousarray(signal),
+        float(initial_balance),
+        float(fee_rate),
+        np.nan if stop_loss_pct is None else float(stop_loss_pct),
+        np.nan if take_profit_pct is None else float(take_profit_pct),
+    )
+
+    final_equity = float(equity[-1])
+    total_return = (final_equity / initial_balance) - 1
+
+    # Trades DataFrame only for reporting
+    if num_trades:
+        entry_px = entry_px[:num_trades]
+        exit_px = exit_px[:num_trades]
+        trades_df = pd.DataFrame({
+            "entry_time": df.index[entry_idx[:num_trades]],
+            "exit_time": df.index[exit_idx[:num_trades]],
+            "entry_price": entry_px,
+            "exit_price": exit_px,
+            "return_pct": (exit_px - entry_px) / entry_px * 100,
+            "exit_reason": np.array(_EXIT_REASONS, dtype=object)[reasons[:num_trades]],
+        })
+    else:
+        trades_df = pd.DataFrame()
 
     # ---- Basic stats ----
     if not trades_df.empty:
@@ -147,10 +260,16 @@ def run_backtest(
         win_rate = avg_return = avg_win = avg_loss = 0.0
         exit_reason_counts = {}
 
-    # Max drawdown
-    rolling_max = eq_df["equity"].cummax()
-    drawdown = eq_df["equity"] / rolling_max - 1
-    max_drawdown_pct = drawdown.min() * 100
+    # Max drawdown (plain ufuncs on the raw float64 array, no Series dispatch)
+    rolling_max = np.maximum.accumulate(equity)
+    max_drawdown_pct = (equity / rolling_max - 1).min() * 100
+
+    # Equity curve df for charting/reporting only, so float32 is plenty;
+    # every stat above comes from the float64 kernel output
+    eq_df = pd.DataFrame(
+        {"equity": equity.astype(np.float32, copy=False)},
+        index=df.index.rename("time"),
+    )
 
     stats = {
         "num_trades": num_trades,
@@ -166,7 +285,7 @@ def run_backtest(
 
     return {
         "equity_curve": eq_df,
-        "final_equity": eq_df["equity"].iloc[-1],
+        "final_equity": final_equity,
         "total_return_pct": total_return * 100,
         "initial_balance": initial_balance,
         "trades": trades_df,
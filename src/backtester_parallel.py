@@ -0,0 +1,176 @@
+# src/backtester_parallel.py
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import repeat
+from typing import Callable, Iterable
+
+import pandas as pd
+
+from .backtester import run_backtest
+from .data import get_historical_klines_cached
+from .strategy import compute_signals
+
+# Workers are spawned, never forked: the callers (e.g. the Streamlit server)
+# are multi-threaded and hold websocket threads and pooled Binance sockets,
+# and a forked child can deadlock on a lock held at fork time or share
+# those sockets with the parent
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+
+def backtest_symbol(
+    symbol: str,
+    interval: str,
+    limit: int,
+    strategy: str,
+    params: dict,
+    stop_loss_pct: float | None = None,
+    take_profit_pct: float | None = None,
+    initial_balance: float = 10_000.0,
+    fee_rate: float = 0.0004,
+    load_klines: Callable[..., pd.DataFrame] = get_historical_klines_cached,
+) -> dict:
+    """
+    Full pipeline for one symbol: fetch candles -> indicators -> signals -> backtest.
+    Only the indicators the strategy reads are computed.
+    Module-level so it can be pickled into worker processes.
+
+    `load_klines(symbol=, interval=, limit=)` supplies the candles (the
+    on-disk cached Binance fetch by default).
+    """
+    df = load_klines(symbol=symbol, interval=interval, limit=limit)
+    df = compute_signals(df, strategy=strategy, **params)
+    return run_backtest(
+        df,
+        initial_balance=initial_balance,
+        fee_rate=fee_rate,
+        stop_loss_pct=stop_loss_pct,
+        take_profit_pct=take_profit_pct,
+    )
+
+
+def backtest_symbols(
+    symbols: Iterable[str],
+    interval: str,
+    limit: int,
+    strategy: str,
+    params: dict,
+    stop_loss_pct: float | None = None,
+    take_profit_pct: float | None = None,
+    max_workers: int | None = None,
+    load_klines: Callable[..., pd.DataFrame] = get_historical_klines_cached,
+) -> tuple[dict[str, dict], dict[str, str]]:
+    """
+    Backtest several symbols in parallel, one process per symbol
+    (backtests are independent, so this side-steps the GIL).
+
+    Returns:
+      - {symbol: result dict from run_backtest} for the symbols that succeeded
+      - {symbol: error message} for the ones that failed (e.g. a transient
+        Binance error), so one bad symbol doesn't sink the whole batch
+
+    `load_klines` is passed to backtest_symbol; with several symbols it has
+    to be a module-level (picklable) function.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    results: dict[str, dict] = {}
+    errors: dict[str, str] = {}
+
+    job_args = (interval, limit, strategy, params, stop_loss_pct, take_profit_pct)
+
+    # Not worth spinning up a process pool for a single symbol
+    if len(symbols) <= 1:
+        for sym in symbols:
+            try:
+                results[sym] = backtest_symbol(sym, *job_args, load_klines=load_klines)
+            except Exception as e:
+                errors[sym] = str(e)
+        return results, errors
+
+    if max_workers is None:
+        max_workers = min(len(symbols), os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=_MP_CONTEXT) as ex:
+        futures = {
+            ex.submit(backtest_symbol, sym, *job_args, load_klines=load_klines): sym
+            for sym in symbols
+        }
+        for fut in as_completed(futures):
+            sym = futures[fut]
+            try:
+                results[sym] = fut.result()
+            except Exception as e:
+                errors[sym] = str(e)
+
+    # Keep the caller's symbol order regardless of completion order
+    results = {sym: results[sym] for sym in symbols if sym in results}
+    return results, errors
+
+
+# Candles shared by every job of a parameter sweep, set once per worker
+_sweep_df: pd.DataFrame | None = None
+
+
+def _init_sweep_worker(df: pd.DataFrame):
+    global _sweep_df
+    _sweep_df = df
+
+
+def _sweep_job(strategy: str, params: dict, backtest_kwargs: dict) -> dict:
+    df = compute_signals(_sweep_df, strategy=strategy, **params)
+    return run_backtest(df, **backtest_kwargs)
+
+
+def backtest_param_grid(
+    df: pd.DataFrame,
+    strategy: str,
+    param_grid: Iterable[dict],
+    max_workers: int | None = None,
+    **backtest_kwargs,
+) -> list[dict]:
+    """
+    Backtest one set of candles under many strategy parameter sets in
+    parallel (e.g. an entry/exit RSI sweep), one process per core.
+
+    `df` is the raw OHLCV frame; it is sent to each worker once rather than
+    with every job. `backtest_kwargs` (stop_loss_pct, fee_rate, ...) are
+    passed to run_backtest for every job. Returns the run_backtest result
+    dicts in `param_grid` order.
+    """
+    param_grid = list(param_grid)
+    if max_workers is None:
+        max_workers = min(len(param_grid), os.cpu_count() or 1)
+
+    # Not worth spinning up a process pool for a single worker
+    if max_workers <= 1:
+        _init_sweep_worker(df)
+        try:
+            return [_sweep_job(strategy, params, backtest_kwargs) for params in param_grid]
+        finally:
+            _init_sweep_worker(None)
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=_MP_CONTEXT,
+        initializer=_init_sweep_worker,
+        initargs=(df,),
+    ) as ex:
+        chunksize = max(1, len(param_grid) // (max_workers * 4))
+        return list(ex.map(_sweep_job, repeat(strategy), param_grid, repeat(backtest_kwargs), chunksize=chunksize))
+
+
+def summarize_results(results: dict[str, dict]) -> pd.DataFrame:
+    """
+    One row of headline stats per symbol, for comparing a batch at a glance.
+    """
+    rows = {
+        sym: {
+            "final_equity": r["final_equity"],
+            "total_return_pct": r["total_return_pct"],
+            "num_trades": r["stats"]["num_trades"],
+            "win_rate_pct": r["stats"]["win_rate_pct"],
+            "max_drawdown_pct": r["stats"]["max_drawdown_pct"],
+        }
+        for sym, r in results.items()
+    }
+    return pd.DataFrame.from_dict(rows, orient="index").rename_axis("symbol")
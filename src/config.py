@@ -1,7 +1,10 @@
 # src/config.py
 import os
+from functools import lru_cache
+
 from dotenv import load_dotenv
 from binance.client import Client
+from requests.adapters import HTTPAdapter
 
 # Load .env from config/.env
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -12,27 +15,43 @@ TRADING_ENV = os.getenv("TRADING_ENV", "testnet").lower()
 LIVE_TRADING_CONFIRMATION = os.getenv("LIVE_TRADING_CONFIRMATION", "")
 
 
+@lru_cache(maxsize=1)
 def get_binance_client() -> Client:
     """
     Return a Binance client configured for either testnet or live,
     based on TRADING_ENV in .env.
+
+    The client is built once per process and shared: constructing one pings
+    the API and opens a fresh HTTP session, so every caller reusing it keeps
+    the same pooled keep-alive connections.
     """
     if TRADING_ENV == "testnet":
         api_key = os.getenv("BINANCE_TESTNET_API_KEY") or os.getenv("BINANCE_API_KEY")
         api_secret = os.getenv("BINANCE_TESTNET_API_SECRET") or os.getenv("BINANCE_API_SECRET")
         if not api_key or not api_secret:
             raise RuntimeError("Missing BINANCE_TESTNET_API_KEY / BINANCE_TESTNET_API_SECRET in .env")
-        return Client(api_key, api_secret, testnet=True)
+        client = Client(api_key, api_secret, testnet=True)
 
-    if TRADING_ENV == "live":
+    elif TRADING_ENV == "live":
         api_key = os.getenv("BINANCE_LIVE_API_KEY")
         api_secret = os.getenv("BINANCE_LIVE_API_SECRET")
         if not api_key or not api_secret:
             raise RuntimeError("Missing BINANCE_LIVE_API_KEY / BINANCE_LIVE_API_SECRET in .env")
         # Live Spot client (testnet=False)
-        return Client(api_key, api_secret, testnet=False)
+        client = Client(api_key, api_secret, testnet=False)
+
+    else:
+        raise RuntimeError(f"Unknown TRADING_ENV: {TRADING_ENV}")
 
-    raise RuntimeError(f"Unknown TRADING_ENV: {TRADING_ENV}")
+    # Room for a few concurrent requests (dashboard sessions, threads). The
+    # pool size is only set when an adapter is built, so this mounts a new
+    # one, carrying over the retry policy of the adapter python-binance's
+    # session came with (requests' default, unless a version configures one)
+    retries = client.session.get_adapter("https://api.binance.com").max_retries
+    client.session.mount(
+        "https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries)
+    )
+    return client
 
 
 def ensure_live_trading_allowed():
@@ -1,9 +1,19 @@
+import os
+import time
+import numpy as np
 import pandas as pd
 from typing import Literal
 from .config import get_binance_client
 
 Interval = Literal["1m", "5m", "15m", "1h", "4h", "1d"]
 
+INTERVAL_SECONDS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600, "4h": 14_400, "1d": 86_400}
+
+# On-disk klines cache for backtests (see get_historical_klines_cached)
+CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "klines"
+)
+
 def get_historical_klines(
     symbol: str = "BTCUSDT",
     interval: Interval = "1m",
@@ -16,19 +26,113 @@ def get_historical_klines(
     client = get_binance_client()
     candles = client.get_klines(symbol=symbol, interval=interval, limit=limit)
 
-    cols = [
-        "open_time", "open", "high", "low", "close", "volume",
-        "close_time", "quote_asset_volume", "num_trades",
-        "taker_buy_base", "taker_buy_quote", "ignore"
-    ]
+    # Only open_time + OHLCV are kept, so build those straight from the raw
+    # rows (numeric strings) in one conversion instead of going through a
+    # 12-column object DataFrame and per-column astype
+    values = np.array([c[1:6] for c in candles], dtype=np.float64).reshape(-1, 5)
+    open_time = pd.to_datetime(np.array([c[0] for c in candles], dtype=np.int64), unit="ms")
+
+    # Lay each column out contiguously (one (5, n) C-order block) so
+    # df[col].to_numpy() hands indicators / the backtest kernel unit-stride
+    # arrays instead of views striding over the row-major rows
+    return pd.DataFrame(
+        np.ascontiguousarray(values.T).T,
+        columns=["open", "high", "low", "close", "volume"],
+        index=pd.DatetimeIndex(open_time, name="open_time"),
+    )
+
+
+def _read_cached_klines(path: str) -> pd.DataFrame | None:
+    try:
+        return pd.read_pickle(path)
+    except Exception:
+        return None  # unreadable entry: treat as a miss
+
+
+def _refresh_open_candle(df: pd.DataFrame, symbol: str, interval: str) -> pd.DataFrame:
+    """
+    A cache entry's last candle was still open when it was stored: replace it
+    with its current values (one limit=1 fetch), so callers see the live
+    partial candle as an uncached fetch would.
+    """
+    try:
+        latest = get_historical_klines(symbol=symbol, interval=interval, limit=1)
+    except Exception as e:
+        print(f"[WARN] Could not refresh open {symbol} {interval} candle, using cached values: {e}")
+        return df
+
+    if len(latest) and len(df) and latest.index[-1] == df.index[-1]:
+        df = pd.concat([df.iloc[:-1], latest])
+    return df
+
+
+def get_historical_klines_cached(
+    symbol: str = "BTCUSDT",
+    interval: Interval = "1m",
+    limit: int = 500
+) -> pd.DataFrame:
+    """
+    get_historical_klines with a persistent on-disk cache, for backtests.
+
+    Entries are keyed on (symbol, interval, limit) plus the current candle
+    period, so repeated backtests within the same candle - across dashboard
+    restarts, worker processes and scripts - skip the network entirely, and
+    a new candle opening invalidates them. On such a miss only the candles
+    opened since the previous entry's last one (which may have still been
+    open then) are downloaded and merged onto it. On a hit only the
+    still-open last candle is refetched, so it is never frozen at the
+    values it had when the entry was written.
+    """
+    seconds = INTERVAL_SECONDS.get(interval)
+    if seconds is None:
+        return get_historical_klines(symbol=symbol, interval=interval, limit=limit)
+
+    prefix = f"{symbol}_{interval}_{limit}_"
+    bucket = int(time.time() // seconds)
+    name = f"{prefix}{bucket}.pkl"
+    path = os.path.join(CACHE_DIR, name)
+
+    if os.path.exists(path):
+        df = _read_cached_klines(path)
+        if df is not None:
+            return _refresh_open_candle(df, symbol, interval)
+
+    # entries from earlier candle periods can never be hit again, but the
+    # newest one still holds most of the candles we need
+    older = []
+    if os.path.isdir(CACHE_DIR):
+        older = sorted(
+            (f for f in os.listdir(CACHE_DIR)
+             if f.startswith(prefix) and f.endswith(".pkl") and f != name),
+            key=lambda f: int(f[len(prefix):-4]),
+        )
+    previous = _read_cached_klines(os.path.join(CACHE_DIR, older[-1])) if older else None
 
-    df = pd.DataFrame(candles, columns=cols)
+    df = None
+    if previous is not None and len(previous):
+        # candle periods from the previous last candle (refetched, it may
+        # have closed since) up to the currently open one
+        missing = bucket - int(previous.index[-1].timestamp() // seconds) + 1
+        if 0 < missing < limit:
+            recent = get_historical_klines(symbol=symbol, interval=interval, limit=missing)
+            if len(recent):
+                df = pd.concat([previous[previous.index < recent.index[0]], recent]).iloc[-limit:]
+    if df is None:
+        df = get_historical_klines(symbol=symbol, interval=interval, limit=limit)
 
-    # Convert
-    for col in ["open", "high", "low", "close", "volume"]:
-        df[col] = df[col].astype(float)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # write-then-rename so concurrent readers never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
 
-    df["open_time"] = pd.to_datetime(df["open_time"], unit="ms")
-    df.set_index("open_time", inplace=True)
+        for old in older:
+            try:
+                os.remove(os.path.join(CACHE_DIR, old))
+            except FileNotFoundError:
+                pass  # already pruned by another process
+    except OSError as e:
+        print(f"[WARN] Could not write klines cache {path}: {e}")
 
-    return df[["open", "high", "low", "close", "volume"]]
\ No newline at end of file
+    return df
@@ -1,25 +1,124 @@
 # src/indicators.py
+import math
+from collections import deque
+from typing import Iterable
+
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 def add_sma(df: pd.DataFrame, period: int, column: str = "close") -> pd.DataFrame:
     df[f"SMA_{period}"] = df[column].rolling(window=period).mean()
     return df
 
 def add_rsi(df: pd.DataFrame, period: int = 14, column: str = "close") -> pd.DataFrame:
-    delta = df[column].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    """
+    RSI from the simple mean gain / mean loss of the last `period` bars, in
+    one NumPy pass over the column (no intermediate Series).
+    """
+    close = df[column].to_numpy(np.float64)
+    n = close.shape[0]
 
-    rs = gain / loss
-    df["RSI"] = 100 - (100 / (1 + rs))
+    # Per-bar gains/losses; the first bar (no previous close) counts as 0
+    delta = np.diff(close)
+    gain = np.zeros(n)
+    loss = np.zeros(n)
+    np.fmax(delta, 0.0, out=gain[1:])
+    np.fmax(-delta, 0.0, out=loss[1:])
+
+    rsi = np.full(n, np.nan)
+    if n >= period:
+        # Window sums rather than a running cumsum, so an all-flat window is
+        # exactly 0 (RSI NaN / 100) instead of rounding noise; the 1/period of
+        # both means cancels in gain / loss
+        gain_sum = sliding_window_view(gain, period).sum(axis=1)
+        loss_sum = sliding_window_view(loss, period).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi[period - 1:] = 100 - (100 / (1 + gain_sum / loss_sum))
+
+    df["RSI"] = rsi
     return df
 
-def add_indicators(df: pd.DataFrame) -> pd.DataFrame:
+# SMA periods the strategies use by default
+DEFAULT_SMA_PERIODS = (5, 10, 20, 50)
+
+
+def add_indicators(
+    df: pd.DataFrame,
+    sma_periods: Iterable[int] = DEFAULT_SMA_PERIODS,
+    rsi: bool = True,
+) -> pd.DataFrame:
     """
     Add a set of SMAs + RSI to support the strategies.
+
+    Pass a wider `sma_periods` panel (e.g. every period a UI lets the user
+    pick) to compute it once and switch strategies / SMA params without
+    recomputing indicators, or a narrower one (and rsi=False) to compute only
+    what a single strategy reads.
     """
-    for p in [5, 10, 20, 50]:
-        df = add_sma(df, p)
+    close = df["close"]
+    smas = {f"SMA_{p}": close.rolling(window=p).mean() for p in sma_periods}
+    # Attach all SMA columns in one go rather than one insert per period,
+    # replacing any same-named ones so re-running doesn't duplicate labels
+    df = pd.concat(
+        [df.drop(columns=list(smas), errors="ignore"), pd.DataFrame(smas, index=df.index)],
+        axis=1,
+    )
 
-    df = add_rsi(df, 14)
+    if rsi:
+        df = add_rsi(df, 14)
     return df
+
+
+# ===========================================
+# Incremental RSI (live path)
+# ===========================================
+
+def rsi_state(closes: Iterable[float], period: int = 14) -> dict:
+    """
+    Rolling state for add_rsi's RSI, built from the closes of CLOSED candles
+    (oldest first): the last close and the gains/losses of the most recent
+    `period - 1` bars. Together with a new close this is enough to get the
+    RSI of the next bar without recomputing the whole series.
+    """
+    state = {
+        "period": period,
+        "last_close": None,
+        "gains": deque(maxlen=period - 1),
+        "losses": deque(maxlen=period - 1),
+    }
+    for close in closes:
+        rsi_state_push(state, close)
+    return state
+
+
+def rsi_state_push(state: dict, close: float) -> dict:
+    """
+    Advance the state by one closed candle. O(1).
+    """
+    close = float(close)
+    if state["last_close"] is not None:
+        delta = close - state["last_close"]
+        state["gains"].append(delta if delta > 0 else 0.0)
+        state["losses"].append(-delta if delta < 0 else 0.0)
+    state["last_close"] = close
+    return state
+
+
+def rsi_from_state(state: dict, close: float) -> float:
+    """
+    RSI of the bar closing (or currently trading) at `close`, on top of the
+    closed candles in `state`. Same definition as add_rsi; NaN until the
+    state holds enough history.
+    """
+    period = state["period"]
+    if state["last_close"] is None or len(state["gains"]) < period - 1:
+        return math.nan
+
+    delta = float(close) - state["last_close"]
+    gain = (sum(state["gains"]) + (delta if delta > 0 else 0.0)) / period
+    loss = (sum(state["losses"]) + (-delta if delta < 0 else 0.0)) / period
+
+    if loss == 0:
+        return 100.0 if gain > 0 else math.nan
+    return 100 - (100 / (1 + gain / loss))
@@ -0,0 +1,107 @@
+# src/live_stats.py
+import numpy as np
+import pandas as pd
+
+from ._njit import NUMBA_AVAILABLE, njit
+
+
+@njit(cache=True)
+def _equity_kernel(pnl, initial):
+    """
+    Fused pass over per-trade PnL: equity curve, running max, max drawdown
+    (as a fraction) and number of winning trades, without temporaries.
+    """
+    n = pnl.shape[0]
+    equity = np.empty(n)
+    acc = initial
+    running_max = -np.inf
+    max_drawdown = 0.0
+    wins = 0
+    for i in range(n):
+        acc += pnl[i]
+        equity[i] = acc
+        if acc > running_max:
+            running_max = acc
+        drawdown = (acc - running_max) / running_max
+        if drawdown < max_drawdown:
+            max_drawdown = drawdown
+        if pnl[i] > 0:
+            wins += 1
+    return equity, max_drawdown, wins
+
+
+def equity_stats(pnl: np.ndarray, initial: float):
+    """
+    (equity, max_drawdown, wins) for a float64 PnL array. Runs the Numba
+    kernel when numba is installed, else the equivalent NumPy ufunc chain.
+    NaN PnL counts as 0 (as trade_log does on ingest), so both paths agree.
+    """
+    nan = np.isnan(pnl)
+    if nan.any():
+        pnl = np.where(nan, 0.0, pnl)
+
+    if NUMBA_AVAILABLE:
+        return _equity_kernel(pnl, initial)
+
+    equity = initial + np.cumsum(pnl)
+    running_max = np.maximum.accumulate(equity)
+    drawdown = (equity - running_max) / running_max
+    return equity, drawdown.min(), int((pnl > 0).sum())
+
+
+# Stats for an empty trade log; final_equity is filled in per call
+_EMPTY_STATS = {
+    "equity_curve": None,
+    "final_equity": None,
+    "total_pnl_usdt": 0.0,
+    "total_pnl_pct": 0.0,
+    "num_trades": 0,
+    "win_rate_pct": 0.0,
+    "max_drawdown_pct": 0.0,
+}
+
+
+def compute_live_stats(trades_df: pd.DataFrame, initial_equity: float):
+    """
+    Compute equity curve, PnL, win rate, max drawdown from live trades CSV.
+    Expect columns with at least: 'pnl_usdt' or 'pnl_pct'.
+    The equity curve is returned as a 1-D float32 array for charting (None
+    if no trades); the numeric stats are computed in float64.
+    """
+    if trades_df.empty:
+        stats = _EMPTY_STATS.copy()
+        stats["final_equity"] = initial_equity
+        return stats
+
+    # Prefer pnl_usdt if available; else approximate from pnl_pct / return_pct
+    for col, scale in (
+        ("pnl_usdt", 1.0),
+        ("pnl_pct", initial_equity / 100.0),
+        ("return_pct", initial_equity / 100.0),
+    ):
+        if col in trades_df.columns:
+            pnl_usdt = trades_df[col].to_numpy(np.float64, copy=False) * scale
+            break
+    else:
+        # Fallback: no PnL info, treat as 0
+        pnl_usdt = np.zeros(len(trades_df), dtype=np.float64)
+
+    equity, max_drawdown, wins = equity_stats(pnl_usdt, initial_equity)
+    max_drawdown_pct = max_drawdown * 100.0  # negative value
+
+    final_equity = float(equity[-1])
+    total_pnl_usdt = final_equity - initial_equity
+    total_pnl_pct = (final_equity / initial_equity - 1.0) * 100.0
+
+    num_trades = len(trades_df)
+    win_rate_pct = (wins / num_trades * 100.0) if num_trades > 0 else 0.0
+
+    return {
+        "equity_curve": equity.astype(np.float32, copy=False),
+        "final_equity": final_equity,
+        "total_pnl_usdt": total_pnl_usdt,
+        "total_pnl_pct": total_pnl_pct,
+        "num_trades": num_trades,
+        "win_rate_pct": win_rate_pct,
+        "max_drawdown_pct": float(max_drawdown_pct),
+    }
@@ -1,4 +1,4 @@
-from http import client
+import queue
 import time
 from typing import Literal
 import math
@@ -6,13 +6,15 @@ import os
 import csv
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+from binance import ThreadedWebsocketManager
 from binance.exceptions import BinanceAPIException
-from numpy import sign
 
 from .config import get_binance_client, TRADING_ENV, ensure_live_trading_allowed
-from .data import get_historical_klines
-from .indicators import add_indicators
-from .strategy import generate_signals
+from .data import INTERVAL_SECONDS, get_historical_klines
+from .indicators import rsi_from_state, rsi_state, rsi_state_push
+from .strategy import rsi_v1_signal_array
 
 LOGS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
 os.makedirs(LOGS_DIR, exist_ok=True)
@@ -43,27 +45,53 @@ def append_trade_to_csv(trade: dict, path: str = TRADES_CSV_PATH):
 
 Side = Literal["BUY", "SELL"]
 
-def _format_quantity_for_symbol(client, symbol: str, quantity: float) -> float:
+# symbol -> (fetched_at, (min_qty, max_qty, step_size, decimals)) from the
+# LOT_SIZE filter; refreshed after _LOT_SIZE_TTL seconds
+_LOT_SIZE_CACHE: dict[str, tuple[float, tuple[float, float, float, int]]] = {}
+_LOT_SIZE_TTL = 3600
+
+def _lot_size_filter(client, symbol: str) -> tuple[float, float, float, int] | None:
     """
-    Adjust raw quantity to satisfy Binance LOT_SIZE filter for this symbol.
-    Floors to nearest valid step size and enforces minQty.
+    (min_qty, max_qty, step_size, decimals) of the symbol's LOT_SIZE filter,
+    or None if Binance has none for it. Cached per symbol so orders don't
+    each pay a get_symbol_info round trip; failed lookups aren't cached.
     """
+    cached = _LOT_SIZE_CACHE.get(symbol)
+    if cached is not None and time.monotonic() - cached[0] < _LOT_SIZE_TTL:
+        return cached[1]
+
     info = client.get_symbol_info(symbol)
     if not info:
-        return quantity # fallback, shouldn't happen often
-    
+        return None # fallback, shouldn't happen often
+
     lot_filter = None
     for f in info["filters"]:
         if f["filterType"] == "LOT_SIZE":
             lot_filter = f
             break
-    
+
     if lot_filter is None:
-        return quantity
-    
+        return None
+
     min_qty = float(lot_filter["minQty"])
     max_qty = float(lot_filter["maxQty"])
     step_size = float(lot_filter["stepSize"])
+    # a reasonable number of decimals to round to, based on step_size
+    decimals = max(0, -int(math.log10(step_size))) if 0 < step_size < 1 else 0
+
+    lot = (min_qty, max_qty, step_size, decimals)
+    _LOT_SIZE_CACHE[symbol] = (time.monotonic(), lot)
+    return lot
+
+def _format_quantity_for_symbol(client, symbol: str, quantity: float) -> float:
+    """
+    Adjust raw quantity to satisfy Binance LOT_SIZE filter for this symbol.
+    Floors to nearest valid step size and enforces minQty.
+    """
+    lot = _lot_size_filter(client, symbol)
+    if lot is None:
+        return quantity
+    min_qty, max_qty, step_size, decimals = lot
 
     # clamp to [min_qty, max_qty]
     qty = max(min_qty, min(quantity, max_qty))
@@ -77,8 +105,6 @@ def _format_quantity_for_symbol(client, symbol: str, quantity: float) -> float:
     if qty < min_qty:
         return 0.0
     
-    # round to a reasonable number of decimals based on step_size
-    decimals = max(0, -int(math.log10(step_size))) if step_size < 1 else 0
     return round(qty, decimals)
 
 def place_market_order(symbol: str, side: Side, quantity: float):
@@ -119,6 +145,40 @@ def place_market_order(symbol: str, side: Side, quantity: float):
         print(f"[ERROR] Unexpected error placing order: {e}")
         return None
 
+def _latest_price_rsi(state: dict, symbol: str, interval: str, history_candles: int) -> tuple[float, float]:
+    """
+    Latest price and RSI for a live step.
+
+    RSI state over the closed candles is kept in state["rsi"], so after the
+    first call only the last two candles (just-closed + still-open) are
+    fetched and the RSI is advanced in O(1) instead of recomputed over the
+    history. Missed candles or a new symbol/interval rebuild it from
+    `history_candles` bars.
+    """
+    rsi_st = state.get("rsi")
+    df = None
+    if rsi_st is not None and rsi_st["key"] == (symbol, interval):
+        df = get_historical_klines(symbol=symbol, interval=interval, limit=2)
+        prev_time = df.index[0]
+        if prev_time == rsi_st["open_time"]:
+            # the candle that was open last step has closed
+            rsi_state_push(rsi_st, df["close"].iloc[0])
+            rsi_st["closed_time"] = prev_time
+        elif prev_time != rsi_st["closed_time"]:
+            df = None  # missed candles in between: rebuild from history
+
+    if df is None:
+        df = get_historical_klines(symbol=symbol, interval=interval, limit=history_candles)
+        rsi_st = rsi_state(df["close"].iloc[:-1])
+        rsi_st["key"] = (symbol, interval)
+        rsi_st["closed_time"] = df.index[-2] if len(df) > 1 else None
+        state["rsi"] = rsi_st
+    rsi_st["open_time"] = df.index[-1]
+
+    price = df["close"].iloc[-1]
+    return price, rsi_from_state(rsi_st, price)
+
+
 def live_step_rsi_v1(
     state: dict | None,
     symbol: str = "ETHUSDT",
@@ -153,30 +213,47 @@ def live_step_rsi_v1(
             "position_size": 0.0,
         }
     
-    logs: list[str] = []
-    completed_trades: list[dict] = []
-
+    # 1) Fetch latest price + RSI
+    price, rsi = _latest_price_rsi(state, symbol, interval, history_candles)
 
-    # 1) Fetch latest candles + indicators + signals
-    df = get_historical_klines(symbol=symbol, interval=interval, limit=history_candles)
-    df = add_indicators(df)
-    df = generate_signals(
-        df,
-        strategy="rsi_v1",
-        entry_rsi=entry_rsi,
-        exit_rsi=exit_rsi,
+    # 2) + 3) Signal, then TP / exit or entry
+    logs, completed_trades = _rsi_v1_on_price(
+        state, symbol, price, rsi, position_size_usdt, entry_rsi, exit_rsi, take_profit_pct
     )
+    return state, logs, completed_trades
+
+
+def _rsi_v1_on_price(
+    state: dict,
+    symbol: str,
+    price: float,
+    rsi: float,
+    position_size_usdt: float,
+    entry_rsi: float,
+    exit_rsi: float,
+    take_profit_pct: float,
+    act_on_signal: bool = True,
+) -> tuple[list[str], list[dict]]:
+    """
+    RSI Strategy V1 decision for one price/RSI update: take-profit or RSI
+    exit when in position, entry otherwise. Places the orders, updates
+    `state` and logs closed trades to CSV.
+
+    With act_on_signal=False only the take-profit is checked (no RSI entry
+    or exit), e.g. for intrabar updates of a still-open candle.
+
+    Returns (log lines, completed trades).
+    """
+    logs: list[str] = []
+    completed_trades: list[dict] = []
 
-    latest = df.iloc[-1]
-    price = latest["close"]
-    rsi = latest["RSI"]
-    signal = latest["signal"]
+    signal = rsi_v1_signal_array(np.array([rsi]), entry_rsi, exit_rsi)[0]
 
     logs.append(
         f"[{symbol}] Price: {price:.2f} | RSI: {rsi:.2f} | signal: {signal} | in_position: {state['in_position']}"
     )
 
-    # 2) If in position, check TP or exit
+    # If in position, check TP or exit
     if state["in_position"]:
         entry_price = state["entry_price"]
         tp_level = entry_price * (1 + take_profit_pct)
@@ -210,7 +287,7 @@ def live_step_rsi_v1(
                 logs.append("[TP] SELL order failed, staying in position.")
 
         # Signal-based exit
-        elif signal == -1:
+        elif act_on_signal and signal == -1:
             logs.append(f"[EXIT] RSI exit signal triggered at {price:.2f}.")
             order = place_market_order(symbol, "SELL", state["position_size"])
             if order is not None:
@@ -236,9 +313,9 @@ def live_step_rsi_v1(
                 logs.append("[EXIT] SELL order failed, staying in position.")
 
 
-    # 3) If NOT in position, check for entry
+    # If NOT in position, check for entry
     else:
-        if signal == 1:
+        if act_on_signal and signal == 1:
             qty = position_size_usdt / price
             logs.append(
                 f"[ENTRY] Entry signal detected. Buying approx {qty:.6f} {symbol.split('USDT')[0]} at {price:.2f}."
@@ -253,7 +330,132 @@ def live_step_rsi_v1(
             else:
                 logs.append("[ENTRY FAILED] Staying flat (no position opened).")
 
-    return state, logs, completed_trades
+    return logs, completed_trades
+
+def live_stream_rsi_v1(
+    symbol: str = "ETHUSDT",
+    interval: str = "15m",
+    history_candles: int = 200,
+    position_size_usdt: float = 100.0,
+    entry_rsi: float = 25.0,
+    exit_rsi: float = 80.0,
+    take_profit_pct: float = 0.04,
+    state: dict | None = None,
+) -> dict:
+    """
+    Event-driven variant of the live_step_rsi_v1 loop on TESTNET: instead
+    of polling REST every N seconds, subscribe to the <symbol>@kline_<interval>
+    websocket and act on kline updates as they arrive.
+
+    RSI entries and exits are only taken on closed klines (k["x"]), from the
+    closed candle's RSI. Intrabar updates of the open candle only check the
+    take-profit of an open position.
+
+    The RSI state is warmed up once over REST (history_candles bars), then
+    advanced from the stream: each closed kline is pushed into it. If a
+    candle's close was missed (reconnect) the state is rebuilt over REST.
+
+    Websocket callbacks only enqueue messages; orders are placed from this
+    thread, one update at a time. Runs until Ctrl+C and returns the state.
+    """
+    if TRADING_ENV != "testnet":
+        raise RuntimeError("TRADING_ENV must be 'testnet' for live_stream_rsi_v1 (safety).")
+
+    if state is None:
+        state = {
+            "in_position": False,
+            "entry_price": None,
+            "position_size": 0.0,
+        }
+
+    # Warm-up over REST; its last candle is still open, so TP only
+    price, rsi = _latest_price_rsi(state, symbol, interval, history_candles)
+    for line in _rsi_v1_on_price(
+        state, symbol, price, rsi, position_size_usdt, entry_rsi, exit_rsi, take_profit_pct,
+        act_on_signal=False,
+    )[0]:
+        print(line)
+
+    # candles are contiguous only if each opens one interval after the last
+    bar = pd.Timedelta(seconds=INTERVAL_SECONDS.get(interval, 0)) or None
+
+    updates: queue.Queue = queue.Queue()
+    client = get_binance_client()
+    twm = ThreadedWebsocketManager(
+        api_key=client.API_KEY,
+        api_secret=client.API_SECRET,
+        testnet=TRADING_ENV == "testnet",
+    )
+    twm.daemon = True  # never block interpreter shutdown
+    twm.start()
+    twm.start_kline_socket(callback=updates.put, symbol=symbol, interval=interval)
+
+    print(f"=== Streaming {symbol} {interval} klines for RSI Strategy V1 in {TRADING_ENV} mode ===")
+    print("Press Ctrl+C to stop.\n")
+
+    try:
+        while True:
+            msg = updates.get()
+            if msg.get("e") != "kline":
+                print(f"[WARN] Kline stream message: {msg}")
+                continue
+
+            k = msg["k"]
+            open_time = pd.to_datetime(k["t"], unit="ms")
+            price = float(k["c"])
+
+            try:
+                rsi_st = state.get("rsi")
+                if rsi_st is not None and open_time < rsi_st["open_time"]:
+                    continue  # late update for a candle already handled
+                if rsi_st is None or (
+                    open_time > rsi_st["open_time"]
+                    and (
+                        rsi_st["closed_time"] != rsi_st["open_time"]
+                        or bar is None
+                        or open_time != rsi_st["open_time"] + bar
+                    )
+                ):
+                    # a candle's close (or a whole candle) was missed: rebuild
+                    state.pop("rsi", None)
+                    rest_price, rsi = _latest_price_rsi(state, symbol, interval, history_candles)
+                    rsi_st = state["rsi"]
+                    if rsi_st["open_time"] != open_time:
+                        price = rest_price  # REST is already past this update
+                elif open_time > rsi_st["open_time"]:
+                    rsi_st["open_time"] = open_time
+
+                closed = False
+                if rsi_st["open_time"] == open_time:
+                    rsi = rsi_from_state(rsi_st, price)
+                    if k["x"]:
+                        # candle closed: it becomes part of the RSI history
+                        rsi_state_push(rsi_st, price)
+                        rsi_st["closed_time"] = open_time
+                        closed = True
+
+                # Signals on closed candles only; intrabar updates just TP
+                logs, completed_trades = _rsi_v1_on_price(
+                    state, symbol, price, rsi, position_size_usdt, entry_rsi, exit_rsi, take_profit_pct,
+                    act_on_signal=closed,
+                )
+            except Exception as e:
+                print(f"[ERROR] Unexpected error handling kline update: {e}")
+                continue
+
+            # Status line once per closed candle, actions as they happen
+            for line in logs if closed else logs[1:]:
+                print(line)
+            if completed_trades:
+                print(f"[TRADES] Closed {len(completed_trades)} trade(s).")
+
+    except KeyboardInterrupt:
+        print("\n[STOP] KeyboardInterrupt received. Exiting kline stream.")
+    finally:
+        twm.stop()
+
+    return state
+
 
 def live_loop_rsi_v1(
     symbol: str = "BTCUSDT",
@@ -293,20 +495,9 @@ def live_loop_rsi_v1(
 
     while True:
         try:
-            # 1) Fetch lastest candles
-            df = get_historical_klines(symbol=symbol, interval=interval, limit=history_candles)
-            df = add_indicators(df)
-            df = generate_signals(
-                df,
-                strategy="rsi_v1",
-                entry_rsi=entry_rsi,
-                exit_rsi=exit_rsi,
-            )
-
-            latest = df.iloc[-1]
-            price = latest["close"]
-            rsi = latest["RSI"]
-            signal = latest["signal"]
+            # 1) Fetch lastest price + RSI (incremental, see _latest_price_rsi)
+            price, rsi = _latest_price_rsi(state, symbol, interval, history_candles)
+            signal = rsi_v1_signal_array(np.array([rsi]), entry_rsi, exit_rsi)[0]
 
             print(f"[{symbol}] Price: {price:.2f} | RSI: {rsi:.2f} | signal: {signal} | in_position: {state['in_position']}")
 
@@ -1,6 +1,8 @@
-from numpy.char import lower
+import numpy as np
 import pandas as pd
 
+from .indicators import add_indicators
+
 # ===========================================
 # Strategy 1 - SMA CROSSOVER
 # ===========================================
@@ -11,26 +13,24 @@ def sma_crossover_signals(df: pd.DataFrame, fast: int = 10, slow: int = 20) -> p
         - Sell when fast MA crosses below slow MA
     """
 
-    df = df.copy()
-
     fast_col = f"SMA_{fast}"
     slow_col = f"SMA_{slow}"
 
     if fast_col not in df or slow_col not in df:
         raise ValueError("Missing SMA indicators. Call add_indicators first.")
-    
-    df["signal"] = 0
 
-    df["prev_fast"] = df[fast_col].shift(1)
-    df["prev_slow"] = df[slow_col].shift(1)\
+    # A cross is a sign change of fast - slow between consecutive bars
+    # (from <= 0 to > 0 buys, from >= 0 to < 0 sells); NaN never crosses
+    diff = df[fast_col].to_numpy(np.float64) - df[slow_col].to_numpy(np.float64)
+    prev, cur = diff[:-1], diff[1:]
 
-    buy_condition = (df["prev_fast"] <= df["prev_slow"]) & (df[fast_col] > df[slow_col])
-    sell_condition = (df["prev_fast"] >= df["prev_slow"]) & (df[fast_col] < df[slow_col])
+    signal = np.zeros(diff.shape[0], dtype=np.int8)  # -1 / 0 / 1, one byte per bar
+    signal[1:][(prev <= 0) & (cur > 0)] = 1
+    signal[1:][(prev >= 0) & (cur < 0)] = -1
 
-    df.loc[buy_condition, "signal"] = 1
-    df.loc[sell_condition, "signal"] = -1
-    
-    df.drop(columns=["prev_fast", "prev_slow"], inplace=True)
+    # Shallow copy: only the signal column is new (see rsi_v1_signals)
+    df = df.copy(deep=False)
+    df["signal"] = signal
 
     return df
 
@@ -49,18 +49,17 @@ def rsi_reversal_signals(
         - Sell wehn RSI > upper (overbought)
     """
 
-    df = df.copy()
-
     if "RSI" not in df:
         raise ValueError("Missing RSI indicator. Call add_indicators first.")
-    
-    df["signal"] = 0
 
-    buy_condition = df["RSI"] < lower
-    sell_condition = df["RSI"] > upper
+    rsi = df["RSI"].to_numpy(np.float64)
+    signal = np.zeros(rsi.shape[0], dtype=np.int8)  # -1 / 0 / 1, one byte per bar
+    signal[rsi < lower] = 1
+    signal[rsi > upper] = -1
 
-    df.loc[buy_condition, "signal"] = 1
-    df.loc[sell_condition, "signal"] = -1
+    # Shallow copy: only the signal column is new (see rsi_v1_signals)
+    df = df.copy(deep=False)
+    df["signal"] = signal
 
     return df
 
@@ -80,21 +79,20 @@ def rsi_trend_signals(
         - Enter long when RSI < lower AND in uptrend
         - Exit when RSI > upper OR price falls below trend MA
     """
-    df = df.copy()
-
     trend_col = f"SMA_{trend_ma}"
     if "RSI" not in df or trend_col not in df:
         raise ValueError("Missing RSI or trend SMA. Call add_indicators first.")
-    
-    df["signal"] = 0
 
-    uptrend = df["close"] > df[trend_col]
+    rsi = df["RSI"].to_numpy(np.float64)
+    uptrend = df["close"].to_numpy(np.float64) > df[trend_col].to_numpy(np.float64)
 
-    buy_condition = (df["RSI"] < lower) & uptrend
-    sell_condition = (df["RSI"] > upper) | (~uptrend)
+    signal = np.zeros(rsi.shape[0], dtype=np.int8)  # -1 / 0 / 1, one byte per bar
+    signal[(rsi < lower) & uptrend] = 1
+    signal[(rsi > upper) | ~uptrend] = -1
 
-    df.loc[buy_condition, "signal"] = 1
-    df.loc[sell_condition, "signal"] = -1
+    # Shallow copy: only the signal column is new (see rsi_v1_signals)
+    df = df.copy(deep=False)
+    df["signal"] = signal
 
     return df
 
@@ -117,25 +115,53 @@ def rsi_v1_signals(
         - Optional take-profit (e.g. 4%) handled in backtester / live trader
     """
 
-    df = df.copy()
-
     if "RSI" not in df:
         raise ValueError("Missing RSI indicator. Call add_indicators first.")
 
-    df["signal"] = 0
+    # Shallow copy: the result shares the input's columns and only gets its
+    # own signal column, instead of cloning every OHLCV/indicator column
+    df = df.copy(deep=False)
+    df["signal"] = rsi_v1_signal_array(df["RSI"].to_numpy(np.float64), entry_rsi, exit_rsi)
 
-    buy_condition = df["RSI"] < entry_rsi
-    sell_condition = df["RSI"] > exit_rsi
+    return df
 
-    df.loc[buy_condition, "signal"] = 1
-    df.loc[sell_condition, "signal"] = -1
 
-    return df
+def rsi_v1_signal_array(
+    rsi: np.ndarray,
+    entry_rsi: float = 25.0,
+    exit_rsi: float = 80.0,
+) -> np.ndarray:
+    """
+    Strategy V1 on a raw RSI array, without pandas: int8 1 where
+    RSI < entry_rsi, -1 where RSI > exit_rsi, 0 otherwise (NaN -> 0).
+    """
+    signal = np.zeros(rsi.shape[0], dtype=np.int8)
+    signal[rsi < entry_rsi] = 1
+    signal[rsi > exit_rsi] = -1
+    return signal
 
 # ===========================================
 # DISPATCHER (choose strategy)
 # ===========================================
 
+# Strategy name -> (signal function, default params). Params a strategy
+# doesn't take are ignored, as with the old if/elif dispatcher.
+_STRATEGIES = {
+    "sma_crossover": (sma_crossover_signals, {"fast": 10, "slow": 20}),
+    "rsi_reversal": (rsi_reversal_signals, {"lower": 30, "upper": 70}),
+    "rsi_trend": (rsi_trend_signals, {"lower": 30, "upper": 60, "trend_ma": 20}),
+    "rsi_v1": (rsi_v1_signals, {"entry_rsi": 25.0, "exit_rsi": 80.0}),
+}
+
+
+def _strategy_params(strategy: str, params: dict):
+    try:
+        fn, defaults = _STRATEGIES[strategy]
+    except KeyError:
+        raise ValueError(f"Unknown strategy: {strategy}") from None
+    return fn, {k: params.get(k, v) for k, v in defaults.items()}
+
+
 def generate_signals(
     df: pd.DataFrame,
     strategy: str = "sma_crossover",
@@ -149,27 +175,28 @@ def generate_signals(
         - 'rsi_trend'
         - 'rsi_v1'
     """
+    fn, params = _strategy_params(strategy, params)
+    return fn(df, **params)
 
-    if strategy == "sma_crossover":
-        fast = params.get("fast", 10)
-        slow = params.get("slow", 20)
-        return sma_crossover_signals(df, fast=fast, slow=slow)
-    
-    elif strategy == "rsi_reversal":
-        lower = params.get("lower", 30)
-        upper = params.get("upper", 70)
-        return rsi_reversal_signals(df, lower=lower, upper=upper)
 
-    elif strategy == "rsi_trend":
-        lower = params.get("lower", 30)
-        upper = params.get("upper", 60)
-        trend_ma = params.get("trend_ma", 20)
-        return rsi_trend_signals(df, lower=lower, upper=upper, trend_ma=trend_ma)
-    
-    elif strategy == "rsi_v1":
-        entry_rsi = params.get("entry_rsi", 25.0)
-        exit_rsi = params.get("exit_rsi", 80.0)
-        return rsi_v1_signals(df, entry_rsi=entry_rsi, exit_rsi=exit_rsi)
+def compute_signals(
+    df: pd.DataFrame,
+    strategy: str = "sma_crossover",
+    **params
+) -> pd.DataFrame:
+    """
+    add_indicators + generate_signals for a one-off run, computing only the
+    indicator columns the chosen strategy reads (e.g. just RSI for rsi_v1,
+    just the two SMAs for sma_crossover) instead of the full set.
+    """
+    fn, params = _strategy_params(strategy, params)
 
+    if strategy == "sma_crossover":
+        sma_periods, rsi = (params["fast"], params["slow"]), False
+    elif strategy == "rsi_trend":
+        sma_periods, rsi = (params["trend_ma"],), True
     else:
-        raise ValueError(f"Unknown strategy: {strategy}")
+        sma_periods, rsi = (), True
+
+    df = add_indicators(df, sma_periods=sma_periods, rsi=rsi)
+    return fn(df, **params)
@@ -0,0 +1,80 @@
+# src/trade_log.py
+import io
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+_lock = threading.Lock()
+
+# path -> {"offset": bytes already parsed, "mtime": file mtime_ns when read,
+#          "df": trades parsed so far}
+_cache: dict[str, dict] = {}
+
+# Per-trade PnL columns the live stats read. They are coerced to float64
+# (bad / missing values -> 0.0) once, as rows are ingested, so the stats can
+# use them as-is on every rerun.
+PNL_COLUMNS = ("pnl_usdt", "pnl_pct", "return_pct")
+
+
+def _parse(chunk: bytes, columns: list[str] | None) -> pd.DataFrame:
+    if columns is None:
+        df = pd.read_csv(io.BytesIO(chunk), engine="pyarrow")
+    else:
+        df = pd.read_csv(io.BytesIO(chunk), engine="pyarrow", header=None, names=columns)
+
+    for col in PNL_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0).astype(np.float64)
+    return df
+
+
+def load_trades_incremental(path: str) -> pd.DataFrame:
+    """
+    Load an append-only trade log CSV (e.g. logs/live_trades.csv).
+
+    Only the bytes appended since the previous call for the same path are
+    parsed and concatenated onto the cached frame; if the file shrank
+    (truncated / rotated) or was rewritten in place at the same size, it is
+    re-read from scratch. A trailing partial line (writer mid-append) is left
+    for the next call. PnL columns come back as float64 (see PNL_COLUMNS).
+
+    The returned DataFrame is shared between calls: treat it as read-only.
+    """
+    stat = os.stat(path)
+    size, mtime = stat.st_size, stat.st_mtime_ns
+
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and (
+            size < entry["offset"] or (size == entry["offset"] and mtime != entry["mtime"])
+        ):
+            entry = None  # file was truncated or rewritten, start over
+        if entry is not None and size == entry["offset"]:
+            return entry["df"]
+
+        offset = entry["offset"] if entry is not None else 0
+        with open(path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read(size - offset)
+
+        # Only consume complete lines
+        end = chunk.rfind(b"\n") + 1
+        if end == 0:
+            return entry["df"] if entry is not None else pd.DataFrame()
+        chunk = chunk[:end]
+
+        if entry is None:
+            df = _parse(chunk, None)
+        else:
+            new_rows = _parse(chunk, list(entry["df"].columns))
+            # A fresh log is header-only on the first read; concat with that
+            # empty frame would only warn about (and guess) its dtypes
+            if entry["df"].empty:
+                df = new_rows
+            else:
+                df = pd.concat([entry["df"], new_rows], ignore_index=True)
+
+        _cache[path] = {"offset": offset + end, "mtime": mtime, "df": df}
+        return df
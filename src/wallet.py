@@ -1,31 +1,79 @@
 from __future__ import annotations
 
-import os
+import json
+import threading
+import time
 from typing import Iterable
 
+from binance import ThreadedWebsocketManager
+
 from .config import TRADING_ENV, get_binance_client
-from .data import get_historical_klines
 
-def get_testnet_balances(assets: Iterable[str] = ("USDT", "BTC", "ETH")) -> dict[str, float]:
+# assets -> (fetched_at, {asset: free balance}) of recent get_testnet_balances calls
+_balance_cache: dict[tuple[str, ...], tuple[float, dict[str, float]]] = {}
+_BALANCE_TTL = 1.0  # seconds
+
+def get_testnet_balances(
+    assets: Iterable[str] = ("USDT", "BTC", "ETH"),
+    *,
+    force_refresh: bool = False,
+) -> dict[str, float]:
     """
     Return free balances for the given assets on TESTNET (or live, if TRADING_ENV is changed.)
+
+    The account is fetched at most once per _BALANCE_TTL seconds for the same
+    assets; pass force_refresh=True to bypass that (e.g. right after an order).
     """
+    assets = tuple(assets)
+    cached = _balance_cache.get(assets)
+    if not force_refresh and cached is not None and time.monotonic() - cached[0] < _BALANCE_TTL:
+        return dict(cached[1])
+
     client = get_binance_client()
     account = client.get_account()
 
-    balances = {asset: 0.0 for asset in assets}
-    for bal in account["balances"]:
-        asset = bal["asset"]
-        if asset in balances:
-            balances[asset] = float(bal["free"])
-    return balances
+    # Only the wanted assets are converted; the account lists hundreds
+    wanted = set(assets)
+    free = {b["asset"]: b["free"] for b in account["balances"] if b["asset"] in wanted}
+    balances = {a: float(free.get(a, 0.0)) for a in assets}
+
+    _balance_cache[assets] = (time.monotonic(), balances)
+    return dict(balances)
+
+# (symbols, fetched_at, {symbol: price}) of the last get_latest_prices call
+_price_cache: tuple[tuple[str, ...], float, dict[str, float]] | None = None
+_PRICE_TTL = 2.0  # seconds
+
+def get_latest_prices(symbols: Iterable[str]) -> dict[str, float]:
+    """
+    Latest traded price per symbol, in one ticker request for all of them.
+    Reused for _PRICE_TTL seconds, so back-to-back snapshots / dashboard
+    reruns don't each go back to the API.
+    """
+    global _price_cache
+    symbols = tuple(symbols)
+    if not symbols:
+        return {}
+
+    cached = _price_cache
+    if cached is not None and cached[0] == symbols and time.monotonic() - cached[1] < _PRICE_TTL:
+        return dict(cached[2])
+
+    client = get_binance_client()
+    if len(symbols) == 1:
+        tickers = [client.get_symbol_ticker(symbol=symbols[0])]
+    else:
+        tickers = client.get_symbol_ticker(symbols=json.dumps(symbols, separators=(",", ":")))
+    prices = {t["symbol"]: float(t["price"]) for t in tickers}
+
+    _price_cache = (symbols, time.monotonic(), prices)
+    return dict(prices)
 
 def get_latest_price(symbol: str) -> float:
     """
-    Get the latest close price for a symbol from klines.
+    Get the latest traded price for a symbol.
     """
-    df = get_historical_klines(symbol=symbol, interval="15m", limit=1)
-    return float(df["close"].iloc[-1])
+    return get_latest_prices((symbol,))[symbol]
 
 def get_equity_snapshot(
     symbols: Iterable[str] = ("BTCUSDT", "ETHUSDT"),
@@ -41,10 +89,19 @@ def get_equity_snapshot(
     """
     balances = get_testnet_balances(assets=(base_asset, "BTC", "ETH"))
 
-    prices = {}
-    for sym in symbols:
-        prices[sym] = get_latest_price(sym)
+    prices = get_latest_prices(symbols)
 
+    return _build_snapshot(balances, prices, base_asset, default_start_equity)
+
+def _build_snapshot(
+    balances: dict[str, float],
+    prices: dict[str, float],
+    base_asset: str,
+    start_equity: float,
+) -> dict:
+    """
+    Turn balances + prices into the snapshot dict returned by get_equity_snapshot.
+    """
     # Covert holding to USDT
     usdt = balances.get(base_asset, 0.0)
     btc = balances.get("BTC", 0.0)
@@ -56,7 +113,6 @@ def get_equity_snapshot(
     equity_usdt = usdt + btc * btc_price + eth * eth_price
 
     # For V1 we just compare vs a fixed starting equity
-    start_equity = default_start_equity
     pnl_pct = (equity_usdt - start_equity) / start_equity * 100 if start_equity > 0 else 0.0
 
     return {
@@ -68,4 +124,169 @@ def get_equity_snapshot(
         "start_equity": start_equity,
     }
 
+# Stream data older than this is treated as stale. miniTicker pushes about
+# once a second, so a silent ticker socket means the connection is gone.
+_STREAM_STALE_AFTER = 30.0  # seconds
+
+class EquityStream:
+    """
+    Equity snapshot kept up to date by Binance websockets, so readers get the
+    latest value without a REST round-trip:
+        - one REST snapshot at start (balances + prices)
+        - <symbol>@miniTicker streams update prices
+        - the user data stream (outboundAccountPosition) updates balances
+
+    If the streams fail or go quiet for _STREAM_STALE_AFTER seconds (dropped
+    connection, expired listen key), snapshot() falls back to a REST snapshot
+    and restarts the sockets.
+
+    Callbacks run on the websocket manager's thread; snapshot() is safe to call
+    from any thread.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str] = ("BTCUSDT", "ETHUSDT"),
+        base_asset: str = "USDT",
+        default_start_equity: float = 10_000.0,
+    ):
+        self._symbols = tuple(symbols)
+        snapshot = get_equity_snapshot(self._symbols, base_asset, default_start_equity)
+
+        self._lock = threading.Lock()
+        self._resync_lock = threading.Lock()
+        self._balances = dict(snapshot["balances"])
+        self._prices = dict(snapshot["prices"])
+        self._base_asset = base_asset
+        self._start_equity = default_start_equity
+        self._snapshot = snapshot
+        self._updated_at = time.monotonic()  # last REST snapshot or stream message
+        self._ticker_socket = None
+        self._user_socket = None
+
+        client = get_binance_client()
+        self._twm = ThreadedWebsocketManager(
+            api_key=client.API_KEY,
+            api_secret=client.API_SECRET,
+            testnet=TRADING_ENV == "testnet",
+        )
+        self._twm.daemon = True  # never block interpreter shutdown
+        self._twm.start()
+        self._start_sockets()
+
+    def _start_sockets(self):
+        # A socket that fails to start stays None, which snapshot() treats as
+        # stale (REST fallback + another start attempt)
+        try:
+            ticker_socket = self._twm.start_multiplex_socket(
+                callback=self._on_ticker,
+                streams=[f"{sym.lower()}@miniTicker" for sym in self._symbols],
+            )
+        except Exception as e:
+            print(f"[WARN] Could not start price stream: {e}")
+            ticker_socket = None
+        try:
+            user_socket = self._twm.start_user_socket(callback=self._on_user_event)
+        except Exception as e:
+            print(f"[WARN] Could not start user data stream: {e}")
+            user_socket = None
+
+        with self._lock:
+            self._ticker_socket = ticker_socket
+            self._user_socket = user_socket
+        self._started_at = time.monotonic()
+
+    def _restart_sockets(self):
+        with self._lock:
+            sockets = (self._ticker_socket, self._user_socket)
+            self._ticker_socket = self._user_socket = None
+        for name in sockets:
+            if name is not None:
+                self._twm.stop_socket(name)
+        self._start_sockets()
+
+    def _on_ticker(self, msg: dict):
+        data = msg.get("data", msg)
+        if data.get("e") == "error":
+            print(f"[WARN] Price stream error: {data.get('m')}")
+            with self._lock:
+                self._ticker_socket = None
+            return
+        if data.get("e") != "24hrMiniTicker":
+            return
+        with self._lock:
+            self._updated_at = time.monotonic()
+            if data["s"] in self._prices:
+                self._prices[data["s"]] = float(data["c"])
+                self._refresh()
+
+    def _on_user_event(self, msg: dict):
+        if msg.get("e") == "error":
+            print(f"[WARN] User data stream error: {msg.get('m')}")
+            with self._lock:
+                self._user_socket = None
+            return
+        with self._lock:
+            self._updated_at = time.monotonic()
+            if msg.get("e") != "outboundAccountPosition":
+                return
+            for bal in msg["B"]:
+                if bal["a"] in self._balances:
+                    self._balances[bal["a"]] = float(bal["f"])
+            self._refresh()
+
+    def _refresh(self):
+        # caller holds self._lock
+        self._snapshot = _build_snapshot(
+            dict(self._balances), dict(self._prices), self._base_asset, self._start_equity
+        )
+
+    def _is_stale(self) -> bool:
+        # caller holds self._lock
+        return (
+            self._ticker_socket is None
+            or self._user_socket is None
+            or time.monotonic() - self._updated_at >= _STREAM_STALE_AFTER
+        )
+
+    def _resync(self):
+        """
+        REST fallback for stale stream data; the sockets are restarted at
+        most once per _STREAM_STALE_AFTER.
+        """
+        try:
+            snapshot = get_equity_snapshot(self._symbols, self._base_asset, self._start_equity)
+        except Exception as e:
+            print(f"[WARN] REST equity snapshot failed: {e}")
+        else:
+            with self._lock:
+                self._balances.update(snapshot["balances"])
+                self._prices.update(snapshot["prices"])
+                self._refresh()
+                self._updated_at = time.monotonic()
+
+        if time.monotonic() - self._started_at >= _STREAM_STALE_AFTER:
+            self._restart_sockets()
+
+    def snapshot(self) -> dict:
+        """
+        Latest equity snapshot: same shape as get_equity_snapshot, plus
+        "age_s" (seconds since the data was last updated) and "stale" (True
+        when even the REST fallback couldn't refresh it).
+        """
+        with self._lock:
+            stale = self._is_stale()
+
+        # One caller refreshes; concurrent callers get the current data
+        if stale and self._resync_lock.acquire(blocking=False):
+            try:
+                self._resync()
+            finally:
+                self._resync_lock.release()
+
+        with self._lock:
+            age = time.monotonic() - self._updated_at
+            return {**self._snapshot, "age_s": age, "stale": age >= _STREAM_STALE_AFTER}
 
+    def stop(self):
+        self._twm.stop()
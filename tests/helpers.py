@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+
+
+def make_klines(n: int = 500, seed: int = 0, freq: str = "15min") -> pd.DataFrame:
+    """
+    Deterministic random-walk OHLCV frame shaped like get_historical_klines.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close * (1 + rng.uniform(0, 0.01, n)),
+            "low": close * (1 - rng.uniform(0, 0.01, n)),
+            "close": close,
+            "volume": rng.uniform(1, 10, n),
+        },
+        index=pd.date_range("2024-01-01", periods=n, freq=freq, name="open_time"),
+    )
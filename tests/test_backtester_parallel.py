@@ -0,0 +1,42 @@
+import unittest
+import zlib
+
+from src.backtester import run_backtest
+from src.backtester_parallel import backtest_symbols
+from src.strategy import compute_signals
+
+from .helpers import make_klines
+
+
+def stub_klines(symbol: str, interval: str, limit: int):
+    """
+    Module-level klines loader, so spawned workers can unpickle it.
+    """
+    if symbol == "BADUSDT":
+        raise RuntimeError("Invalid symbol.")
+    return make_klines(limit, seed=zlib.crc32(symbol.encode()))
+
+
+class BacktestSymbolsTest(unittest.TestCase):
+    def test_multi_symbol_batch_through_pool(self):
+        symbols = ["ETHUSDT", "BTCUSDT", "BADUSDT", "SOLUSDT"]
+        params = {"entry_rsi": 30.0, "exit_rsi": 70.0}
+
+        results, errors = backtest_symbols(
+            symbols, "15m", 300, "rsi_v1", params,
+            take_profit_pct=0.02, max_workers=2, load_klines=stub_klines,
+        )
+
+        self.assertEqual(list(results), ["ETHUSDT", "BTCUSDT", "SOLUSDT"])
+        self.assertEqual(errors, {"BADUSDT": "Invalid symbol."})
+
+        # Same numbers as running the pipeline in-process
+        for sym, result in results.items():
+            df = compute_signals(stub_klines(sym, "15m", 300), strategy="rsi_v1", **params)
+            expected = run_backtest(df, take_profit_pct=0.02)
+            self.assertAlmostEqual(result["final_equity"], expected["final_equity"])
+            self.assertEqual(result["stats"]["num_trades"], expected["stats"]["num_trades"])
+
+
+if __name__ == "__main__":
+    unittest.main()
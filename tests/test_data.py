@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from src import data
+
+from .helpers import make_klines
+
+BAR = 15 * 60  # seconds
+
+
+class FakeMarket:
+    """
+    get_historical_klines stand-in: the candles up to `now`, the last one
+    still open with its close moving as `tick` advances.
+    """
+
+    def __init__(self):
+        self.candles = make_klines(1000, freq="15min")
+        self.now = self.candles.index[599].timestamp() + 60
+        self.tick = 0.0
+        self.limits = []
+
+    def get_klines(self, symbol, interval, limit):
+        self.limits.append(limit)
+        upto = self.candles[self.candles.index.map(pd.Timestamp.timestamp) <= self.now]
+        df = upto.iloc[-limit:].copy()
+        df.iloc[-1, df.columns.get_loc("close")] += self.tick
+        return df
+
+
+class KlinesCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.market = FakeMarket()
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        patches = [
+            mock.patch.object(data, "CACHE_DIR", cache_dir),
+            mock.patch.object(data, "get_historical_klines", side_effect=self.market.get_klines),
+            mock.patch.object(data.time, "time", side_effect=lambda: self.market.now),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def load(self):
+        return data.get_historical_klines_cached("ETHUSDT", "15m", 200)
+
+    def test_hit_refreshes_the_open_candle(self):
+        first = self.load()
+        self.market.tick = 1.5  # open candle trades on within the same period
+        second = self.load()
+
+        self.assertEqual(self.market.limits, [200, 1])
+        self.assertEqual(len(second), 200)
+        self.assertEqual(second["close"].iloc[-1], first["close"].iloc[-1] + 1.5)
+        pd.testing.assert_frame_equal(second.iloc[:-1], first.iloc[:-1])
+
+    def test_prune_race_is_silent(self):
+        self.load()
+        self.market.now += BAR  # next candle opens: the entry above is pruned
+
+        with (
+            mock.patch.object(data.os, "remove", side_effect=FileNotFoundError),
+            mock.patch("builtins.print") as printed,
+        ):
+            df = self.load()
+
+        printed.assert_not_called()
+        self.assertEqual(self.market.limits, [200, 2])
+        self.assertEqual(len(df), 200)
+        self.assertEqual(len(os.listdir(data.CACHE_DIR)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
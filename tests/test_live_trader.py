@@ -0,0 +1,116 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src import live_trader
+
+BAR_MS = 15 * 60 * 1000
+
+
+class _Stop(dict):
+    """
+    Queued after the replayed messages; reading it ends the stream loop the
+    same way Ctrl+C does.
+    """
+
+    def get(self, *args):
+        raise KeyboardInterrupt
+
+
+class ReplaySocketManager:
+    """
+    Stand-in for ThreadedWebsocketManager that replays `messages` into the
+    kline callback as soon as the socket is started.
+    """
+
+    messages: list = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    def start(self):
+        pass
+
+    def start_kline_socket(self, callback, symbol, interval):
+        for msg in self.messages:
+            callback(msg)
+        callback(_Stop())
+
+    def stop(self):
+        pass
+
+
+def kline(bar: int, close: float, closed: bool) -> dict:
+    return {"e": "kline", "k": {"t": bar * BAR_MS, "c": str(close), "x": closed}}
+
+
+def falling_klines(symbol: str, interval: str, limit: int) -> pd.DataFrame:
+    """
+    REST history: `limit` 15m candles, each closing 1 below the last (RSI 0),
+    the last one still open.
+    """
+    close = 200.0 - np.arange(limit, dtype=np.float64)
+    return pd.DataFrame(
+        {"open": close, "high": close, "low": close, "close": close, "volume": 1.0},
+        index=pd.to_datetime(np.arange(limit, dtype=np.int64) * BAR_MS, unit="ms"),
+    )
+
+
+class LiveStreamReplayTest(unittest.TestCase):
+    def replay(self, messages: list) -> tuple[list, list]:
+        orders, trades = [], []
+        ReplaySocketManager.messages = messages
+        with (
+            mock.patch.object(live_trader, "TRADING_ENV", "testnet"),
+            mock.patch.object(live_trader, "get_binance_client"),
+            mock.patch.object(live_trader, "ThreadedWebsocketManager", ReplaySocketManager),
+            mock.patch.object(live_trader, "get_historical_klines", side_effect=falling_klines),
+            mock.patch.object(
+                live_trader, "place_market_order",
+                side_effect=lambda symbol, side, qty: orders.append((side, qty)) or {"status": "FILLED"},
+            ),
+            mock.patch.object(live_trader, "append_trade_to_csv", side_effect=trades.append),
+            mock.patch("builtins.print"),
+        ):
+            live_trader.live_stream_rsi_v1(
+                symbol="ETHUSDT", interval="15m", history_candles=50,
+                position_size_usdt=100.0, entry_rsi=25.0, exit_rsi=5.0, take_profit_pct=0.04,
+            )
+        return orders, trades
+
+    def test_signals_on_closed_klines_take_profit_intrabar(self):
+        # Candle 49 is open after warm-up (RSI 0 < entry_rsi throughout)
+        orders, trades = self.replay([
+            kline(49, 150.5, closed=False),  # oversold, but the candle is still open
+            kline(49, 150.0, closed=True),   # closes oversold -> BUY at 150
+            kline(50, 152.0, closed=False),  # RSI > exit_rsi intrabar: no RSI exit
+            kline(50, 156.5, closed=False),  # >= 150 * 1.04 -> take-profit intrabar
+            kline(50, 156.0, closed=True),
+        ])
+
+        self.assertEqual(orders, [("BUY", 100.0 / 150.0), ("SELL", 100.0 / 150.0)])
+        self.assertEqual(len(trades), 1)
+        self.assertEqual(trades[0]["exit_reason"], "take_profit")
+        self.assertEqual((trades[0]["entry_price"], trades[0]["exit_price"]), (150.0, 156.5))
+
+    def test_rsi_exit_waits_for_the_close(self):
+        orders, trades = self.replay([
+            kline(49, 150.0, closed=True),   # BUY at 150
+            kline(50, 151.0, closed=False),  # RSI > exit_rsi, candle open: hold
+            kline(50, 151.0, closed=True),   # closes above exit_rsi -> SELL
+        ])
+
+        self.assertEqual([side for side, _ in orders], ["BUY", "SELL"])
+        self.assertEqual(trades[0]["exit_reason"], "signal")
+        self.assertEqual(trades[0]["exit_price"], 151.0)
+
+    def test_warm_up_never_enters(self):
+        # The REST warm-up ends on an open, oversold candle
+        orders, _ = self.replay([kline(49, 149.0, closed=False)])
+        self.assertEqual(orders, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+import warnings
+
+import numpy as np
+
+from src.trade_log import load_trades_incremental
+
+HEADER = "time,symbol,side,size,entry_price,exit_price,return_pct,exit_reason\n"
+ROWS = [
+    "2024-01-01T00:15:00,ETHUSDT,LONG,0.05,2000.0,2080.0,4.0,take_profit\n",
+    "2024-01-01T02:30:00,ETHUSDT,LONG,0.05,2050.0,2030.0,-0.975609756,signal\n",
+]
+
+
+class LoadTradesIncrementalTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    def append(self, text: str):
+        with open(self.path, "a") as f:
+            f.write(text)
+
+    def test_header_only_then_rows_appended(self):
+        self.append(HEADER)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")  # e.g. concat FutureWarnings
+
+            df = load_trades_incremental(self.path)
+            self.assertTrue(df.empty)
+            self.assertEqual(list(df.columns), HEADER.strip().split(","))
+
+            self.append(ROWS[0])
+            df = load_trades_incremental(self.path)
+            self.assertEqual(len(df), 1)
+
+            self.append(ROWS[1])
+            df = load_trades_incremental(self.path)
+
+        self.assertEqual(len(df), 2)
+        self.assertEqual(df["return_pct"].dtype, np.float64)
+        self.assertEqual(list(df["exit_reason"]), ["take_profit", "signal"])
+
+    def test_partial_line_waits_for_newline(self):
+        self.append(HEADER + ROWS[0] + ROWS[1][:20])
+        self.assertEqual(len(load_trades_incremental(self.path)), 1)
+
+        self.append(ROWS[1][20:])
+        self.assertEqual(len(load_trades_incremental(self.path)), 2)
+
+    def test_same_size_rewrite_is_reread(self):
+        self.append(HEADER + ROWS[0])
+        self.assertEqual(load_trades_incremental(self.path)["exit_price"][0], 2080.0)
+
+        # Rotated and rewritten with a different trade of the same byte length
+        with open(self.path, "w") as f:
+            f.write(HEADER + ROWS[0].replace("2080.0", "2070.0"))
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        self.assertEqual(load_trades_incremental(self.path)["exit_price"][0], 2070.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import time
+import unittest
+from unittest import mock
+
+from src import wallet
+
+
+class FakeSocketManager:
+    """
+    Stand-in for ThreadedWebsocketManager: records started/stopped sockets
+    and lets the test push messages through the registered callbacks.
+    """
+
+    def __init__(self, **kwargs):
+        self.callbacks = {}
+        self.stopped = []
+
+    def start(self):
+        pass
+
+    def start_multiplex_socket(self, callback, streams):
+        self.callbacks["ticker"] = callback
+        return f"ticker{len(self.stopped)}"
+
+    def start_user_socket(self, callback):
+        self.callbacks["user"] = callback
+        return f"user{len(self.stopped)}"
+
+    def stop_socket(self, name):
+        self.stopped.append(name)
+
+
+def rest_snapshot(symbols, base_asset, default_start_equity, btc_price=50_000.0):
+    return wallet._build_snapshot(
+        {"USDT": 1_000.0, "BTC": 0.1, "ETH": 0.0},
+        {"BTCUSDT": btc_price, "ETHUSDT": 3_000.0},
+        base_asset,
+        default_start_equity,
+    )
+
+
+class EquityStreamTest(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            mock.patch.object(wallet, "ThreadedWebsocketManager", FakeSocketManager),
+            mock.patch.object(wallet, "get_binance_client"),
+            mock.patch.object(wallet, "get_equity_snapshot", side_effect=rest_snapshot),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.stream = wallet.EquityStream()
+        self.twm = self.stream._twm
+
+    def test_stream_updates_are_served_fresh(self):
+        self.twm.callbacks["ticker"]({"data": {"e": "24hrMiniTicker", "s": "BTCUSDT", "c": "60000"}})
+
+        snap = self.stream.snapshot()
+        self.assertEqual(snap["equity_usdt"], 1_000.0 + 0.1 * 60_000.0)
+        self.assertFalse(snap["stale"])
+        self.assertLess(snap["age_s"], 1.0)
+        self.assertEqual(wallet.get_equity_snapshot.call_count, 1)  # only at start
+
+    def test_socket_error_falls_back_to_rest_and_restarts(self):
+        self.twm.callbacks["ticker"]({"data": {"e": "24hrMiniTicker", "s": "BTCUSDT", "c": "60000"}})
+        self.twm.callbacks["user"]({"e": "error", "type": "ConnectionClosed", "m": "listenKey expired"})
+
+        with mock.patch.object(wallet, "_STREAM_STALE_AFTER", 0.0):
+            snap = self.stream.snapshot()
+
+        # REST price replaces the last streamed one, and both sockets restart
+        self.assertEqual(snap["equity_usdt"], 1_000.0 + 0.1 * 50_000.0)
+        self.assertEqual(wallet.get_equity_snapshot.call_count, 2)
+        self.assertEqual(self.twm.stopped, ["ticker0"])
+        self.assertEqual(self.stream._user_socket, "user1")
+
+    def test_quiet_streams_are_stale(self):
+        with mock.patch.object(wallet, "_STREAM_STALE_AFTER", 0.05):
+            time.sleep(0.06)
+            wallet.get_equity_snapshot.side_effect = RuntimeError("network down")
+            snap = self.stream.snapshot()
+
+        self.assertTrue(snap["stale"])
+        self.assertGreaterEqual(snap["age_s"], 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()